@@ -2,19 +2,43 @@
 API endpoints for content generation and related operations.
 """
 
+import hashlib
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
+from pydantic import BaseModel, Field
 
 from app.db.session import get_db
 from app.services.content_service import ContentService
 from app.crud import topic, content_suggestion
-from app.schemas.content import GeneratedContent
+from app.schemas.content import GeneratedContent, GeneratedContentBatch
 
 router = APIRouter()
 
+# 话题的内容建议基本是静态数据，允许浏览器和代理缓存；过期后凭ETag重新验证
+SUGGESTIONS_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=60"
+# 随机内容建议每次请求都不同，不允许任何缓存
+RANDOM_SUGGESTIONS_CACHE_CONTROL = "no-store"
+
+
+# 批量生成单次最多处理的话题数，避免一个请求加载并渲染任意多个话题
+MAX_BATCH_TOPICS = 100
+
+
+class TopicIdsRequest(BaseModel):
+    topic_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_TOPICS)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
 
 @router.get("/generate/{topic_id}", response_model=GeneratedContent)
 async def generate_content(
@@ -27,15 +51,14 @@ async def generate_content(
     This endpoint generates content suggestions based on the selected topic.
     """
     try:
-        # Check if topic exists
-        topic_obj = await topic.get(db, id=topic_id)
-        if not topic_obj:
+        # 走批量生成的路径：话题和模板的加载方式与批量接口一致
+        contents = await ContentService.generate_content_for_topics(db, [topic_id])
+        if topic_id not in contents:
             raise HTTPException(status_code=404, detail=f"Topic with ID {topic_id} not found")
         
-        # Generate content
-        generated_content = await ContentService.generate_content_for_topic(db, topic_id)
-        
-        return generated_content
+        return contents[topic_id]
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Value error in generate_content: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,6 +70,33 @@ async def generate_content(
         )
 
 
+@router.post("/generate/batch", response_model=GeneratedContentBatch)
+async def generate_content_batch(
+    request: TopicIdsRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Generate content for several topics in one request.
+    
+    Topics are loaded with a single query; IDs that do not exist are
+    returned in `not_found`. At most MAX_BATCH_TOPICS IDs are accepted and
+    duplicates are ignored.
+    """
+    try:
+        # 去重，重复的ID只生成一次
+        topic_ids = list(dict.fromkeys(request.topic_ids))
+        contents = await ContentService.generate_content_for_topics(db, topic_ids)
+        not_found = [topic_id for topic_id in topic_ids if topic_id not in contents]
+        
+        return {"contents": contents, "not_found": not_found}
+    except Exception as e:
+        logger.error(f"Error generating content for topics {request.topic_ids}: {e}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error generating content: {str(e)}"
+        )
+
+
 @router.get("/subtopics")
 async def get_subtopics(
     topic_title: str = Query(..., description="The main topic title"),
@@ -70,6 +120,8 @@ async def get_subtopics(
 
 @router.get("/suggestions")
 async def get_content_suggestions(
+    request: Request,
+    response: Response,
     topic_id: Optional[int] = Query(None, description="Topic ID to get suggestions for"),
     limit: int = Query(10, ge=1, le=50, description="Number of suggestions to return"),
     db: AsyncSession = Depends(get_db),
@@ -78,19 +130,30 @@ async def get_content_suggestions(
     Get content suggestions.
     
     This endpoint returns content suggestions for a specific topic or random suggestions if no topic is specified.
+    Topic responses carry an ETag derived from the topic's suggestion count and last update;
+    a matching If-None-Match gets 304. Random suggestions are never cached.
     """
     try:
         if topic_id:
-            # 检查话题是否存在
+            # 先检查话题是否存在：不存在或已删除的话题的ETag都相同，不能返回304
             topic_obj = await topic.get(db, id=topic_id)
             if not topic_obj:
                 raise HTTPException(status_code=404, detail=f"Topic with ID {topic_id} not found")
             
+            # ETag由数据本身生成：建议增删改后条数或最后更新时间随之变化
+            count, last_updated = await content_suggestion.get_topic_stats(db, topic_id=topic_id)
+            etag = f'"{hashlib.md5(f"{topic_id}:{limit}:{count}:{last_updated}".encode()).hexdigest()}"'
+            cache_headers = {"ETag": etag, "Cache-Control": SUGGESTIONS_CACHE_CONTROL}
+            if _etag_matches(request, etag):
+                return Response(status_code=304, headers=cache_headers)
+            
             # 获取话题的内容建议
             suggestions = await content_suggestion.get_by_topic(db, topic_id=topic_id, limit=limit)
+            response.headers.update(cache_headers)
         else:
             # 获取随机内容建议
             suggestions = await content_suggestion.get_random(db, limit=limit)
+            response.headers["Cache-Control"] = RANDOM_SUGGESTIONS_CACHE_CONTROL
         
         # 转换为响应格式
         result = {
@@ -70,9 +70,9 @@ async def cache_status():
     if redis_manager.is_connected and redis_manager.redis_client:
         try:
             # Count HeatLink API caches
-            heatlink_keys = await redis_manager.redis_client.keys("heatlink:*")
+            heatlink_keys = await redis_manager.keys("heatlink:*")
             # Count topic caches
-            topic_keys = await redis_manager.redis_client.keys("topics:*")
+            topic_keys = await redis_manager.keys("topics:*")
             
             # Get DB size (total number of keys)
             db_size = await redis_manager.redis_client.dbsize()
@@ -82,6 +82,7 @@ async def cache_status():
             
             cache_info.update({
                 "total_keys": db_size,
+                "pool": redis_manager.pool_stats(),
                 "heatlink_cache_count": len(heatlink_keys),
                 "topic_cache_count": len(topic_keys),
                 # Group HeatLink caches by type
@@ -1,12 +1,12 @@
+import uuid
 from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 from pydantic import BaseModel
 import asyncio
 from datetime import datetime, timezone
 from sqlalchemy import select, or_
-from sqlalchemy.dialects.postgresql import JSONB
 
 from app.db.session import get_db_auto_commit, async_session_maker
 from app.services.news_heat_score_service import heat_score_service, CACHE_PREFIX
@@ -70,11 +70,14 @@ async def post_detailed_heat_scores(
 
 @router.get("/top", response_model=List[Dict[str, Any]])
 async def get_top_news(
+    response: Response,
     limit: int = Query(50, description="Maximum number of items to return"),
     skip: int = Query(0, description="Number of items to skip"),
     min_score: Optional[float] = Query(30.0, description="Minimum heat score"),
     max_age_hours: Optional[int] = Query(72, description="Maximum age in hours"),
     category: Optional[str] = Query(None, description="Filter news by category. Multiple categories can be specified as comma-separated values, e.g. 'news,social,video'"),
+    cursor_heat: Optional[float] = Query(None, description="heat_score of the last item of the previous page (from X-Next-Cursor-Heat)"),
+    cursor_id: Optional[uuid.UUID] = Query(None, description="id of the last item of the previous page (from X-Next-Cursor-Id)"),
     db: AsyncSession = Depends(get_db_auto_commit)
 ):
     """
@@ -87,6 +90,8 @@ async def get_top_news(
     - **min_score**: 最低热度分数阈值
     - **max_age_hours**: 最大时效性（小时）
     - **category**: 按新闻分类筛选，支持多分类（逗号分隔，如'news,social,video'）
+    - **cursor_heat / cursor_id**: 游标分页，取自上一页响应头 X-Next-Cursor-Heat / X-Next-Cursor-Id；
+      深分页时代替skip，避免OFFSET扫描
     """
     try:
         logger.info(f"API 请求: 获取热门新闻 limit={limit}, skip={skip}, min_score={min_score}, max_age_hours={max_age_hours}, category={category}")
@@ -98,7 +103,9 @@ async def get_top_news(
             min_score=min_score,
             max_age_hours=max_age_hours,
             category=category,
-            session=db
+            session=db,
+            cursor_heat=cursor_heat,
+            cursor_id=cursor_id,
         )
         
         # 验证结果类型
@@ -113,6 +120,12 @@ async def get_top_news(
                 logger.error(f"无法将结果转换为列表: {e}")
                 news_list = []
         
+        # 本页已满时通过响应头返回下一页游标，响应体保持列表格式不变
+        if limit and len(news_list) == limit:
+            last = news_list[-1]
+            response.headers["X-Next-Cursor-Heat"] = str(last["heat_score"])
+            response.headers["X-Next-Cursor-Id"] = str(last["id"])
+        
         logger.info(f"成功获取热门新闻列表，返回 {len(news_list)} 条记录")
         return news_list
     except Exception as e:
@@ -404,7 +417,7 @@ async def run_category_update():
             stmt = select(NewsHeatScore).where(
                 or_(
                     NewsHeatScore.meta_data.is_(None),
-                    ~NewsHeatScore.meta_data.cast(JSONB).op('?')('category')
+                    ~NewsHeatScore.meta_data.has_key('category')
                 )
             ).limit(5000)  # 限制一次处理的记录数量
             
@@ -424,6 +437,7 @@ async def run_category_update():
                     record.meta_data = {"category": category}
                 else:
                     record.meta_data["category"] = category
+                record.category = category
                 
                 session.add(record)
                 updated_count += 1
@@ -8,9 +8,10 @@ from sqlalchemy import select
 
 from app.db.redis import redis_manager
 from app.db.session import get_db
-from app.services.heatlink_client import heatlink_client
+from app.services.heatlink_client import DEFAULT_CATEGORIES, heatlink_client
 from app.crud.topic import topic as topic_crud
 from app.models.topic import Topic
+from app.schemas.topic import TopicList
 
 router = APIRouter()
 
@@ -126,6 +127,40 @@ async def get_hot_topics(
             )
 
 
+@router.get("", response_model=TopicList)
+async def list_topics(
+    category: Optional[str] = Query(None, description="Filter by category"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor_heat: Optional[float] = Query(None, description="heat of next_cursor from the previous page"),
+    cursor_id: Optional[int] = Query(None, description="id of next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Whether to return the total count"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List topics ordered by heat.
+    
+    Pass the ``next_cursor`` of the previous page as ``cursor_heat``/``cursor_id``
+    to fetch the next page without OFFSET; ``include_total=false`` skips the count.
+    """
+    try:
+        return await topic_crud.get_by_category_with_pagination(
+            db,
+            category=category,
+            page=page,
+            page_size=page_size,
+            cursor_heat=cursor_heat,
+            cursor_id=cursor_id,
+            include_total=include_total,
+        )
+    except Exception as e:
+        logger.error(f"Error listing topics: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error listing topics: {str(e)}"
+        )
+
+
 @router.get("/search")
 async def search_topics(
     query: str = Query(..., min_length=1, description="Search query"),
@@ -228,13 +263,7 @@ async def get_categories(
         # Ensure we have some categories even if empty
         if not categories:
             logger.warning("No categories found in sources stats, using defaults")
-            categories = {
-                "科技": 0,
-                "财经": 0,
-                "教育": 0,
-                "汽车": 0,
-                "未分类": 0
-            }
+            categories = DEFAULT_CATEGORIES
         
         result = {
             "categories": [
@@ -273,7 +302,7 @@ async def get_topic_detail(
     Returns detailed information about a specific topic.
     """
     try:
-        topic = await topic_crud.get(db, id=topic_id)
+        topic = await topic_crud.get_with_suggestions(db, id=topic_id)
         if not topic:
             raise HTTPException(
                 status_code=404,
@@ -327,7 +356,7 @@ async def clear_topics_cache(
         if cache_type:
             if cache_type == "hot":
                 # Clear hot topics caches
-                keys = await redis_manager.redis_client.keys("topics:hot:*")
+                keys = [key async for key in redis_manager.iter_keys("topics:hot:*")]
                 cleared_keys.extend(keys)
                 if keys:
                     await redis_manager.redis_client.delete(*keys)
@@ -337,14 +366,14 @@ async def clear_topics_cache(
                 
             elif cache_type == "categories":
                 # Clear categories caches
-                keys = await redis_manager.redis_client.keys("categories:*")
+                keys = [key async for key in redis_manager.iter_keys("categories:*")]
                 cleared_keys.extend(keys)
                 if keys:
                     await redis_manager.redis_client.delete(*keys)
                 
             elif cache_type == "sources":
                 # Clear sources caches
-                keys = await redis_manager.redis_client.keys("sources:*")
+                keys = [key async for key in redis_manager.iter_keys("sources:*")]
                 cleared_keys.extend(keys)
                 if keys:
                     await redis_manager.redis_client.delete(*keys)
@@ -354,9 +383,9 @@ async def clear_topics_cache(
                 
             elif cache_type == "all":
                 # Clear all topic related caches
-                keys = await redis_manager.redis_client.keys("topics:*")
-                keys.extend(await redis_manager.redis_client.keys("categories:*"))
-                keys.extend(await redis_manager.redis_client.keys("sources:*"))
+                keys = [key async for key in redis_manager.iter_keys("topics:*")]
+                keys.extend([key async for key in redis_manager.iter_keys("categories:*")])
+                keys.extend([key async for key in redis_manager.iter_keys("sources:*")])
                 cleared_keys.extend(keys)
                 if keys:
                     await redis_manager.redis_client.delete(*keys)
@@ -370,7 +399,7 @@ async def clear_topics_cache(
                 }
         else:
             # Default: clear all topic caches
-            keys = await redis_manager.redis_client.keys("topics:*")
+            keys = [key async for key in redis_manager.iter_keys("topics:*")]
             cleared_keys.extend(keys)
             if keys:
                 await redis_manager.redis_client.delete(*keys)
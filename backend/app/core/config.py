@@ -26,9 +26,15 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str
     TEST_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 20  # Web请求连接池常驻连接数
+    DB_MAX_OVERFLOW: int = 10  # 高峰期允许额外创建的连接数
+    DB_POOL_TIMEOUT: int = 30  # 等待空闲连接的超时时间（秒）
+    SQL_SLOW_QUERY_MS: float = 500  # 超过该耗时（毫秒）的SQL一律记录
+    SQL_LOG_SAMPLE_RATE: float = 0.001  # 其余SQL按该比例抽样记录；DEBUG模式下全部记录
     
     # Redis settings
     REDIS_URL: str
+    REDIS_POOL_SIZE: int = 50  # 连接池最大连接数
     
     # JWT settings
     SECRET_KEY: str
@@ -49,6 +55,9 @@ class Settings(BaseSettings):
     # HeatLink API settings
     HEATLINK_API_URL: str
     HEATLINK_API_TIMEOUT: int = 60
+    # 发往HeatLink的请求速率上限（每秒请求数，<=0表示不限速）和允许的突发请求数
+    HEATLINK_RATE_LIMIT: float = 20
+    HEATLINK_RATE_BURST: int = 20
     
     class Config:
         env_file = ".env"
@@ -112,6 +112,7 @@ def setup_logging() -> None:
         format=CONSOLE_FORMAT,
         level="INFO",  # 控制台使用INFO级别
         colorize=True,
+        enqueue=True,
         filter=lambda record: (
             # 排除详细的过程日志
             not any(keyword in record["message"].lower() for keyword in [
@@ -166,6 +167,7 @@ def setup_logging() -> None:
         rotation="10 MB",
         retention="1 week",
         format=FILE_FORMAT,
+        enqueue=True,
         level="INFO"
     )
     
@@ -176,6 +178,7 @@ def setup_logging() -> None:
         rotation="10 MB",
         retention="1 week",
         format=FILE_FORMAT,
+        enqueue=True,
         level="DEBUG",
         filter=lambda record: (
             record["name"].startswith("app.services.heatlink_client") or
@@ -190,6 +193,7 @@ def setup_logging() -> None:
         rotation="10 MB",
         retention="1 week",
         format=FILE_FORMAT,
+        enqueue=True,
         level="DEBUG",
         filter=lambda record: (
             record["name"].startswith("app.core.scheduler") or
@@ -206,6 +210,7 @@ def setup_logging() -> None:
         rotation="10 MB",
         retention="1 week",
         format=FILE_FORMAT,
+        enqueue=True,
         level="INFO",
         filter=lambda record: (
             "计划任务" in record["message"] or
@@ -222,6 +227,7 @@ def setup_logging() -> None:
         retention="1 month",  # 错误日志保留更长时间
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | ERROR | {message}\n{exception}",
         level="ERROR",
+        enqueue=True,
         backtrace=True,
         diagnose=True
     )
@@ -1,13 +1,31 @@
 import asyncio
+import traceback
 from datetime import datetime, timedelta
-import time
 from typing import Dict, List, Callable, Any, Awaitable, Optional
 
 from fastapi import FastAPI
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
+from app.db.session import BackgroundSessionLocal
+
+# 停止调度器时，给正在执行的任务完成当前一轮的宽限时间（秒）
+STOP_GRACE_PERIOD = 10
+
+
+async def _shielded(aw: Awaitable[Any]) -> Any:
+    """Run a session operation so that cancellation cannot interrupt it midway.
+
+    If the caller is cancelled (timeout or shutdown) the operation is still
+    awaited to completion before the cancellation propagates, so the session
+    is never closed while a ROLLBACK is in flight.
+    """
+    inner = asyncio.ensure_future(aw)
+    try:
+        return await asyncio.shield(inner)
+    except asyncio.CancelledError:
+        await inner
+        raise
 
 
 class TaskScheduler:
@@ -19,16 +37,12 @@ class TaskScheduler:
         self.app = None
     
     def setup(self, app: FastAPI):
-        """Setup the scheduler with the FastAPI app."""
-        self.app = app
-        
-        @app.on_event("startup")
-        async def startup_scheduler():
-            await self.start()
+        """Setup the scheduler with the FastAPI app.
         
-        @app.on_event("shutdown")
-        async def shutdown_scheduler():
-            await self.stop()
+        The app lifespan owns start/stop, so no startup/shutdown hooks are
+        registered here; doing both would drive the same instance twice.
+        """
+        self.app = app
         
         logger.info("⚡ 任务调度器设置完成")
     
@@ -51,7 +65,6 @@ class TaskScheduler:
                 logger.info(f"✅ 任务启动成功: {task_id}")
             except Exception as e:
                 logger.error(f"❌ 任务启动失败 [{task_id}]: {str(e)}")
-                import traceback
                 logger.error(traceback.format_exc())
     
     async def stop(self):
@@ -67,6 +80,20 @@ class TaskScheduler:
         if task_count > 0:
             logger.info(f"📋 发现 {task_count} 个运行中的任务")
         
+        running_tasks = [
+            task_info["task"] for task_info in self.tasks.values()
+            if task_info.get("task") is not None
+        ]
+        
+        # 正在执行的任务先给一个宽限期完成当前这一轮，处于休眠中的任务直接取消
+        executing_tasks = [
+            task_info["task"] for task_info in self.tasks.values()
+            if task_info.get("task") is not None and task_info.get("executing")
+        ]
+        if executing_tasks:
+            logger.info(f"⏳ 等待 {len(executing_tasks)} 个执行中的任务完成，最多 {STOP_GRACE_PERIOD} 秒")
+            await asyncio.wait(executing_tasks, timeout=STOP_GRACE_PERIOD)
+        
         for task_id, task_info in self.tasks.items():
             if "task" in task_info and task_info["task"] is not None:
                 try:
@@ -74,82 +101,125 @@ class TaskScheduler:
                     logger.info(f"✅ 任务已停止: {task_id}")
                 except Exception as e:
                     logger.error(f"❌ 任务停止失败 [{task_id}]: {str(e)}")
+        
+        await asyncio.gather(*running_tasks, return_exceptions=True)
+    
+    async def _reset_session(self, session: AsyncSession, task_id: str):
+        """Close a task session, ignoring errors from a broken connection."""
+        try:
+            await _shielded(session.close())
+        except Exception as e:
+            logger.warning(f"⚠️ 关闭任务会话失败 [{task_id}]: {e}")
     
     def _start_task(self, task_id: str, task_info: Dict[str, Any]):
         """Start a single task."""
         async def task_wrapper():
-            while self.is_running:
+            # 任务配置在运行期间不会变化，循环外一次性取出
+            func = task_info["func"]
+            interval = task_info["interval"]
+            with_session = task_info.get("with_session", True)
+            max_execution_time = task_info.get("max_execution_time", 300)  # 默认5分钟
+            # 使用事件循环的单调时钟计算耗时，不受系统时间调整影响
+            loop = asyncio.get_running_loop()
+            
+            # 错开各任务的首次执行时间，避免启动时同时访问数据库
+            initial_delay = task_info.get("initial_delay", 0)
+            if initial_delay:
                 try:
-                    start_time = time.time()
-                    logger.info(f"▶️ 开始执行任务: {task_id}")
-                    
-                    success = True
-                    error_msg = None
-                    
-                    # 创建一个任务保护，避免任务执行时间过长
-                    async def protected_task_execution():
-                        # Create a database session for the task
-                        async with SessionLocal() as session:
-                            try:
-                                # Call the task function with session
-                                if task_info.get("with_session", True):
-                                    await task_info["func"](session)
-                                else:
-                                    await task_info["func"]()
-                                    
-                                # 如果任务成功执行而没有显式提交事务，我们在这里提交
-                                if task_info.get("auto_commit", True) and task_info.get("with_session", True):
-                                    if not session.is_active:
-                                        logger.debug(f"会话已关闭，跳过提交 [{task_id}]")
-                                    else:
-                                        await session.commit()
-                            except Exception as e:
-                                # 在出现异常时回滚会话
-                                if task_info.get("with_session", True) and session.is_active:
-                                    await session.rollback()
-                                    logger.warning(f"❌ 任务执行出错，已回滚事务 [{task_id}]")
-                                raise
-                                
+                    await asyncio.sleep(initial_delay)
+                except asyncio.CancelledError:
+                    logger.debug(f"任务首次执行等待被中断 [{task_id}]")
+                    return
+            
+            # 每个任务复用一个长期会话，避免每轮都新建会话；出错后重建
+            session = BackgroundSessionLocal() if with_session else None
+            
+            # 创建一个任务保护，避免任务执行时间过长
+            async def protected_task_execution(session: Optional[AsyncSession]):
+                if not with_session:
+                    await func()
+                    return
+                try:
+                    # Call the task function with session
+                    # 任务函数自行负责提交事务
+                    await func(session)
+                except Exception as e:
+                    # 兜底：任务出错且未自行回滚时，在这里回滚会话
+                    if session.in_transaction():
+                        await _shielded(session.rollback())
+                        logger.warning(f"❌ 任务执行出错，已回滚事务 [{task_id}]")
+                    raise
+                finally:
+                    # 清空标识映射，下一轮重新从数据库加载，不复用过期对象
+                    session.expunge_all()
+            
+            try:
+                while self.is_running:
+                    task_info["executing"] = True
                     try:
-                        # 设置任务执行的最大时间，防止任务无限期执行
-                        max_execution_time = task_info.get("max_execution_time", 300)  # 默认5分钟
-                        await asyncio.wait_for(protected_task_execution(), timeout=max_execution_time)
-                    except asyncio.TimeoutError:
-                        success = False
-                        error_msg = f"任务执行超过最大允许时间 {max_execution_time} 秒"
-                        logger.error(f"⏱️ {error_msg} [{task_id}]")
+                        start_time = loop.time()
+                        logger.info(f"▶️ 开始执行任务: {task_id}")
+                        
+                        success = True
+                        error_msg = None
+                        
+                        try:
+                            # 设置任务执行的最大时间，防止任务无限期执行
+                            await asyncio.wait_for(protected_task_execution(session), timeout=max_execution_time)
+                        except asyncio.TimeoutError:
+                            success = False
+                            error_msg = f"任务执行超过最大允许时间 {max_execution_time} 秒"
+                            logger.error(f"⏱️ {error_msg} [{task_id}]")
+                        except Exception as e:
+                            success = False
+                            error_msg = str(e)
+                            raise
+                        
+                        # 任务完成后记录
+                        duration = loop.time() - start_time
+                        if success:
+                            logger.info(f"✅ 任务执行完成 [{task_id}] - 耗时: {duration:.2f}秒")
+                        else:
+                            logger.error(f"❌ 任务执行失败 [{task_id}] - {error_msg}")
+                            
+                    except asyncio.CancelledError:
+                        logger.info(f"🛑 任务已取消: {task_id}")
+                        break
                     except Exception as e:
-                        success = False
-                        error_msg = str(e)
-                        raise
+                        logger.error(f"❌ 任务执行出错 [{task_id}]: {e}")
+                        logger.error(traceback.format_exc())
+                        # 出错后先让出一次事件循环，避免多个任务同时失败时连续占用循环
+                        await asyncio.sleep(0)
+                    task_info["executing"] = False
                     
-                    # 任务完成后记录
-                    duration = time.time() - start_time
-                    if success:
-                        logger.info(f"✅ 任务执行完成 [{task_id}] - 耗时: {duration:.2f}秒")
-                    else:
-                        logger.error(f"❌ 任务执行失败 [{task_id}] - {error_msg}")
-                        
-                except asyncio.CancelledError:
-                    logger.info(f"🛑 任务已取消: {task_id}")
-                    break
-                except Exception as e:
-                    logger.error(f"❌ 任务执行出错 [{task_id}]: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                
-                # Sleep until next execution
-                next_run = datetime.now() + timedelta(seconds=task_info["interval"])
-                logger.info(f"⏰ 下次执行时间 [{task_id}]: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
-                try:
-                    await asyncio.sleep(task_info["interval"])
-                except asyncio.CancelledError:
-                    logger.debug(f"任务休眠被中断 [{task_id}]")
-                    break
+                    # 超时或出错（包括DisconnectionError等连接失效）后，会话状态不可信，关闭后重建
+                    if session is not None and not success:
+                        await self._reset_session(session, task_id)
+                        session = BackgroundSessionLocal()
+                    
+                    # 调度器已停止时不再进入下一轮休眠
+                    if not self.is_running:
+                        break
+                    
+                    # 惰性格式化：日志级别未启用时不会计算下次执行时间
+                    logger.opt(lazy=True).debug(
+                        "⏰ 下次执行时间 [{}]: {}",
+                        lambda: task_id,
+                        lambda: (datetime.now() + timedelta(seconds=interval)).strftime('%Y-%m-%d %H:%M:%S'),
+                    )
+                    # Sleep until next execution
+                    try:
+                        await asyncio.sleep(interval)
+                    except asyncio.CancelledError:
+                        logger.debug(f"任务休眠被中断 [{task_id}]")
+                        break
+            finally:
+                if session is not None:
+                    await self._reset_session(session, task_id)
         
         # Create and store the task
-        loop = asyncio.get_event_loop()
-        task = loop.create_task(task_wrapper())
+        # 只会在调度器运行中（已有事件循环）时调用；以task_id命名便于调试定位
+        task = asyncio.get_running_loop().create_task(task_wrapper(), name=task_id)
         self.tasks[task_id]["task"] = task
     
     def add_task(
@@ -158,8 +228,8 @@ class TaskScheduler:
         func: Callable[..., Awaitable[Any]], 
         interval: int, 
         with_session: bool = True,
-        auto_commit: bool = True,
-        max_execution_time: Optional[int] = 300  # 添加参数，默认5分钟
+        max_execution_time: Optional[int] = 300,  # 添加参数，默认5分钟
+        initial_delay: int = 0,  # 首次执行前的等待时间（秒）
     ):
         """Add a new task to the scheduler."""
         if task_id in self.tasks:
@@ -170,12 +240,12 @@ class TaskScheduler:
             "func": func,
             "interval": interval,
             "with_session": with_session,
-            "auto_commit": auto_commit,
             "max_execution_time": max_execution_time,
+            "initial_delay": initial_delay,
             "task": None,
         }
         
-        logger.info(f"📝 任务已注册 [{task_id}] - 执行间隔: {interval}秒, 最大执行时间: {max_execution_time}秒")
+        logger.info(f"📝 任务已注册 [{task_id}] - 执行间隔: {interval}秒, 最大执行时间: {max_execution_time}秒, 首次延迟: {initial_delay}秒")
         
         # If scheduler is already running, start the task immediately
         if self.is_running:
@@ -0,0 +1,45 @@
+import os
+import stat
+from typing import Dict, Tuple
+
+from fastapi.staticfiles import StaticFiles
+from loguru import logger
+from starlette.responses import Response
+from starlette.types import Scope
+
+
+class PrecomputedStaticFiles(StaticFiles):
+    """StaticFiles that indexes its directory once at startup.
+
+    Static assets ship with the application and only change on deploy, so the
+    path -> (full_path, stat_result) lookup is built once and served from the
+    dict: known files skip the per-request thread hop, path resolution and
+    os.stat. Paths not in the index fall back to the regular lookup.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._index: Dict[str, Tuple[str, os.stat_result]] = self._build_index()
+        logger.info(f"📁 静态文件索引完成: {len(self._index)} 个文件")
+
+    def _build_index(self) -> Dict[str, Tuple[str, os.stat_result]]:
+        index = {}
+        for directory in self.all_directories:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    rel_path = os.path.relpath(os.path.join(root, name), directory)
+                    # 复用 lookup_path 的目录越界检查；多个目录中同名文件以先出现的为准，与 lookup_path 一致
+                    if rel_path in index:
+                        continue
+                    full_path, stat_result = self.lookup_path(rel_path)
+                    if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                        index[rel_path] = (full_path, stat_result)
+        return index
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            entry = self._index.get(path)
+            if entry is not None:
+                full_path, stat_result = entry
+                return self.file_response(full_path, stat_result, scope)
+        return await super().get_response(path, scope)
@@ -1,10 +1,13 @@
 """
 Schedule and manage periodic tasks.
 """
+import random
+import traceback
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from app.core.scheduler import scheduler
+from app.core.scheduler import _shielded, scheduler
 from app.services.news_heat_score_service import heat_score_service
 
 
@@ -13,14 +16,13 @@ async def update_heat_scores_task(session: AsyncSession):
     logger.info("[任务执行] 开始更新热门新闻热度分数")
     try:
         news_count = await heat_score_service.update_all_heat_scores(session)
-        # 明确提交事务
-        await session.commit()
+        # 明确提交事务；超时或停止调度器时不中断已发出的COMMIT
+        await _shielded(session.commit())
         logger.info(f"[任务完成] 热门新闻热度分数更新完成，已更新 {len(news_count) if news_count else 0} 条记录")
     except Exception as e:
         # 发生异常时回滚
-        await session.rollback()
+        await _shielded(session.rollback())
         logger.error(f"[任务错误] 热门新闻热度分数更新失败 - {str(e)}")
-        import traceback
         logger.error(traceback.format_exc())
         raise
 
@@ -30,14 +32,13 @@ async def update_keyword_heat_task(session: AsyncSession):
     logger.info("[任务执行] 开始更新关键词热度")
     try:
         keywords = await heat_score_service.update_keyword_heat(session)
-        # 明确提交事务
-        await session.commit()
+        # 明确提交事务；超时或停止调度器时不中断已发出的COMMIT
+        await _shielded(session.commit())
         logger.info(f"[任务完成] 关键词热度更新完成，已更新 {len(keywords) if keywords else 0} 个关键词")
     except Exception as e:
         # 发生异常时回滚
-        await session.rollback()
+        await _shielded(session.rollback())
         logger.error(f"[任务错误] 关键词热度更新失败 - {str(e)}")
-        import traceback
         logger.error(traceback.format_exc())
         raise
 
@@ -47,18 +48,22 @@ async def update_source_weights_task(session: AsyncSession):
     logger.info("[任务执行] 开始更新来源权重")
     try:
         sources = await heat_score_service.update_source_weights(session)
-        # 明确提交事务
-        await session.commit()
+        # 明确提交事务；超时或停止调度器时不中断已发出的COMMIT
+        await _shielded(session.commit())
         logger.info(f"[任务完成] 来源权重更新完成，已更新 {len(sources) if sources else 0} 个来源")
     except Exception as e:
         # 发生异常时回滚
-        await session.rollback()
+        await _shielded(session.rollback())
         logger.error(f"[任务错误] 来源权重更新失败 - {str(e)}")
-        import traceback
         logger.error(traceback.format_exc())
         raise
 
 
+def _jittered_delay(base_delay: int, interval: int) -> int:
+    """首次执行延迟加上最多为执行间隔10%的随机抖动，避免重启后任务周期重合"""
+    return base_delay + random.randint(0, interval // 10)
+
+
 def register_tasks():
     """注册所有计划任务"""
     logger.info("🔄 开始注册计划任务...")
@@ -66,28 +71,28 @@ def register_tasks():
     # 更新热度分数 - 每10分钟
     scheduler.add_task(
         "update_heat_scores",
-        heat_score_service.update_all_heat_scores,
+        update_heat_scores_task,
         interval=600,
-        auto_commit=True,
-        max_execution_time=600  # 最多10分钟
+        max_execution_time=600,  # 最多10分钟
+        initial_delay=_jittered_delay(0, 600),
     )
     
     # 更新关键词热度 - 每60分钟
     scheduler.add_task(
         "update_keyword_heat",
-        heat_score_service.update_keyword_heat,
+        update_keyword_heat_task,
         interval=3600,
-        auto_commit=True,
-        max_execution_time=120  # 最多2分钟
+        max_execution_time=120,  # 最多2分钟
+        initial_delay=_jittered_delay(60, 3600),
     )
     
     # 更新来源权重 - 每2小时
     scheduler.add_task(
         "update_source_weights",
-        heat_score_service.update_source_weights,
+        update_source_weights_task,
         interval=7200,
-        auto_commit=True,
-        max_execution_time=180  # 最多3分钟
+        max_execution_time=180,  # 最多3分钟
+        initial_delay=_jittered_delay(120, 7200),
     )
     
     logger.info("✨ 计划任务注册完成，共注册 3 个任务") 
\ No newline at end of file
@@ -2,15 +2,42 @@
 CRUD operations for ContentSuggestion model.
 """
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import bindparam, func
 
 from app.crud.base import CRUDBase
 from app.models.topic import ContentSuggestion
 from app.schemas.content import ContentSuggestionCreate, ContentSuggestionBase
 
+# Statements are built once at import time; call sites only bind parameters.
+_BY_CATEGORY_STMT = (
+    select(ContentSuggestion)
+    .where(ContentSuggestion.category == bindparam("category"))
+    .order_by(ContentSuggestion.position)
+)
+_BY_CATEGORY_AND_TYPE_STMT = (
+    select(ContentSuggestion)
+    .where(
+        ContentSuggestion.category == bindparam("category"),
+        ContentSuggestion.suggestion_type == bindparam("suggestion_type"),
+    )
+    .order_by(ContentSuggestion.position)
+)
+_BY_TOPIC_STMT = (
+    select(ContentSuggestion)
+    .where(ContentSuggestion.topic_id == bindparam("topic_id"))
+    .order_by(ContentSuggestion.position)
+    .limit(bindparam("limit"))
+)
+# 话题内容建议的条数和最后更新时间，接口据此生成ETag
+_TOPIC_STATS_STMT = (
+    select(func.count(ContentSuggestion.id), func.max(ContentSuggestion.updated_at))
+    .where(ContentSuggestion.topic_id == bindparam("topic_id"))
+)
+
 
 class CRUDContentSuggestion(CRUDBase[ContentSuggestion, ContentSuggestionCreate, ContentSuggestionBase]):
     """CRUD operations for ContentSuggestion model."""
@@ -21,13 +48,13 @@ class CRUDContentSuggestion(CRUDBase[ContentSuggestion, ContentSuggestionCreate,
         """
         Get content suggestions by category and optionally by type.
         """
-        query = select(self.model).where(self.model.category == category)
-        
         if suggestion_type:
-            query = query.where(self.model.suggestion_type == suggestion_type)
-            
-        query = query.order_by(self.model.position)
-        result = await db.execute(query)
+            result = await db.execute(
+                _BY_CATEGORY_AND_TYPE_STMT,
+                {"category": category, "suggestion_type": suggestion_type},
+            )
+        else:
+            result = await db.execute(_BY_CATEGORY_STMT, {"category": category})
         return list(result.scalars().all())
     
     async def get_by_topic(
@@ -36,11 +63,19 @@ class CRUDContentSuggestion(CRUDBase[ContentSuggestion, ContentSuggestionCreate,
         """
         Get content suggestions by topic ID.
         """
-        query = select(self.model).where(self.model.topic_id == topic_id)
-        query = query.order_by(self.model.position).limit(limit)
-        result = await db.execute(query)
+        result = await db.execute(_BY_TOPIC_STMT, {"topic_id": topic_id, "limit": limit})
         return list(result.scalars().all())
     
+    async def get_topic_stats(
+        self, db: AsyncSession, *, topic_id: int
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of suggestions of a topic and when they were last updated.
+        """
+        result = await db.execute(_TOPIC_STATS_STMT, {"topic_id": topic_id})
+        count, last_updated = result.one()
+        return count, last_updated
+    
     async def get_random(
         self, db: AsyncSession, *, limit: int = 10
     ) -> List[ContentSuggestion]:
@@ -1,80 +1,139 @@
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Sequence, Union, Any
 
 from loguru import logger
-from sqlalchemy import desc, func, or_
+from sqlalchemy import String, any_, bindparam, desc, func, insert, tuple_
+from sqlalchemy import delete as sql_delete, update as sql_update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from sqlalchemy.future import select
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+try:
+    from sqlalchemy.dialects.postgresql import distinct_on
+except ImportError:  # SQLAlchemy 2.0：尚无distinct_on，select().distinct(列)在该版本未被弃用
+    distinct_on = None
 
 from app.models.news_heat_score import NewsHeatScore
 from app.schemas.news_heat_score import HeatScoreCreate, HeatScoreUpdate
 
 
-async def create(db: AsyncSession, obj_in: HeatScoreCreate) -> NewsHeatScore:
-    """Create a new heat score."""
+def _distinct_on_news_id(stmt: Select) -> Select:
+    """DISTINCT ON (news_id)：配合按news_id、calculated_at倒序排序，每条新闻只保留最新一条"""
+    if distinct_on is not None:
+        return stmt.ext(distinct_on(NewsHeatScore.news_id))
+    return stmt.distinct(NewsHeatScore.news_id)
+
+
+# Statements are built once at import time; call sites only bind parameters.
+_BY_ID_STMT = select(NewsHeatScore).where(NewsHeatScore.id == bindparam("id"))
+_BY_NEWS_ID_STMT = (
+    select(NewsHeatScore)
+    .where(NewsHeatScore.news_id == bindparam("news_id"))
+    .order_by(desc(NewsHeatScore.calculated_at))
+    .limit(1)
+)
+# DISTINCT ON 由数据库为每个news_id只返回最新的一条，不再传回全部历史记录
+_LATEST_BY_NEWS_IDS_STMT = _distinct_on_news_id(
+    select(NewsHeatScore)
+    .where(NewsHeatScore.news_id == any_(bindparam("news_ids", type_=ARRAY(String))))
+    .order_by(NewsHeatScore.news_id, desc(NewsHeatScore.calculated_at))
+)
+_DELETE_BY_ID_STMT = (
+    sql_delete(NewsHeatScore)
+    .where(NewsHeatScore.id == bindparam("id"))
+    .returning(NewsHeatScore.id)
+)
+
+
+def _to_naive_utc(value: Any) -> Any:
+    """Convert an aware datetime to naive UTC; naive values are passed through."""
+    if getattr(value, "tzinfo", None) is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _prepare_create_data(obj_in: HeatScoreCreate) -> Dict[str, Any]:
+    """Build the column values for a new heat score row."""
     # 创建数据字典
     data = obj_in.model_dump(exclude_unset=True)
     
-    # 设置计算时间和更新时间（带时区）
-    now_with_tz = datetime.now(timezone.utc)
-    
     # PostgreSQL需要不带时区的datetime对象，或者明确使用timestamptz类型
-    # 移除时区信息，但保留UTC时间
-    if "published_at" in data and data["published_at"] and data["published_at"].tzinfo is not None:
-        # 保存UTC时间但去掉时区信息
-        data["published_at"] = data["published_at"].replace(tzinfo=None)
+    # 转换为UTC后移除时区信息
+    if "published_at" in data:
+        data["published_at"] = _to_naive_utc(data["published_at"])
+    
+    # calculated_at/updated_at由数据库默认值设置
     
-    # 确保计算时间和更新时间没有时区信息
-    data["calculated_at"] = now_with_tz.replace(tzinfo=None)
-    data["updated_at"] = now_with_tz.replace(tzinfo=None)
+    # 同步冗余的分类列
+    if isinstance(data.get("meta_data"), dict):
+        data["category"] = data["meta_data"].get("category")
     
-    # 创建数据库对象并保存
-    db_obj = NewsHeatScore(**data)
-    db.add(db_obj)
+    return data
+
+
+async def create(db: AsyncSession, obj_in: HeatScoreCreate) -> NewsHeatScore:
+    """Create a new heat score."""
+    data = _prepare_create_data(obj_in)
     
     try:
+        # INSERT ... RETURNING 直接带回数据库生成的字段，无需提交后再refresh
+        result = await db.scalars(insert(NewsHeatScore).values(**data).returning(NewsHeatScore))
+        db_obj = result.one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     except Exception as e:
         await db.rollback()
-        logger.error(f"创建热度评分失败: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"创建热度评分失败: {e}")
+        raise
+
+
+async def bulk_create(db: AsyncSession, objs_in: List[HeatScoreCreate]) -> List[NewsHeatScore]:
+    """Create many heat scores with a single multi-row INSERT ... RETURNING.
+    
+    Heat scores keep their history per news_id, so this appends rows rather
+    than upserting on news_id.
+    """
+    if not objs_in:
+        return []
+    
+    rows = [_prepare_create_data(obj_in) for obj_in in objs_in]
+    
+    try:
+        # 一条INSERT写入所有记录，RETURNING直接带回生成的对象，无需逐条refresh
+        result = await db.scalars(insert(NewsHeatScore).returning(NewsHeatScore), rows)
+        db_objs = list(result.all())
+        await db.commit()
+        return db_objs
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"批量创建热度评分失败: {e}")
         raise
 
 
-async def get(db: AsyncSession, id: str) -> Optional[NewsHeatScore]:
+async def get(db: AsyncSession, id: uuid.UUID) -> Optional[NewsHeatScore]:
     """Get a heat score by ID."""
     try:
-        result = await db.execute(select(NewsHeatScore).where(NewsHeatScore.id == id))
+        result = await db.execute(_BY_ID_STMT, {"id": id})
         # 使用同步方式获取第一个结果
         item = result.scalars().first()
         return item
     except Exception as e:
-        logger.error(f"获取热度评分失败 (ID: {id}): {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"获取热度评分失败 (ID: {id}): {str(e)}")
         raise
 
 
 async def get_by_news_id(db: AsyncSession, news_id: str) -> Optional[NewsHeatScore]:
     """Get the latest heat score for a news item."""
     try:
-        query = (
-            select(NewsHeatScore)
-            .where(NewsHeatScore.news_id == news_id)
-            .order_by(desc(NewsHeatScore.calculated_at))
-        )
-        result = await db.execute(query)
+        result = await db.execute(_BY_NEWS_ID_STMT, {"news_id": news_id})
         # 使用同步方式获取第一个结果
         item = result.scalars().first()
         return item
     except Exception as e:
-        logger.error(f"根据新闻ID获取热度评分失败 (news_id: {news_id}): {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"根据新闻ID获取热度评分失败 (news_id: {news_id}): {str(e)}")
         raise
 
 
@@ -83,103 +142,180 @@ async def get_multi_by_news_ids(
 ) -> Dict[str, NewsHeatScore]:
     """Get heat scores for multiple news items."""
     try:
-        # 如果ID数量太多，使用分批处理以避免SQL查询过长
-        BATCH_SIZE = 100
-        all_scores = {}
+        if not news_ids:
+            return {}
+        
+        logger.debug(f"批量获取热度评分，共 {len(news_ids)} 条")
+        
+        # 所有ID作为一个数组参数传入，无论数量多少都只需一次查询
+        result = await db.execute(_LATEST_BY_NEWS_IDS_STMT, {"news_ids": list(news_ids)})
+        all_scores = {row.news_id: row for row in result.scalars()}
         
-        # 当ID数量超过批处理大小时，分批处理
-        if len(news_ids) > BATCH_SIZE:
-            logger.debug(f"批量获取热度评分，共 {len(news_ids)} 条，分批处理")
-            
-            for i in range(0, len(news_ids), BATCH_SIZE):
-                batch_ids = news_ids[i:i+BATCH_SIZE]
-                logger.debug(f"处理第 {i//BATCH_SIZE + 1} 批，包含 {len(batch_ids)} 条记录")
-                
-                query = (
-                    select(NewsHeatScore)
-                    .where(NewsHeatScore.news_id.in_(batch_ids))
-                    .order_by(desc(NewsHeatScore.calculated_at))
-                )
-                result = await db.execute(query)
-                
-                # 处理这一批结果
-                scalar_result = result.scalars()
-                for row in scalar_result:
-                    if row.news_id not in all_scores:
-                        all_scores[row.news_id] = row
-                
-                logger.debug(f"第 {i//BATCH_SIZE + 1} 批处理完成，累计获取 {len(all_scores)} 条记录")
-        else:
-            # 当ID数量较少时，一次性处理
-            logger.debug(f"批量获取热度评分，共 {len(news_ids)} 条")
-            query = (
-                select(NewsHeatScore)
-                .where(NewsHeatScore.news_id.in_(news_ids))
-                .order_by(desc(NewsHeatScore.calculated_at))
-            )
-            result = await db.execute(query)
-            
-            # 处理结果
-            scalar_result = result.scalars()
-            for row in scalar_result:
-                if row.news_id not in all_scores:
-                    all_scores[row.news_id] = row
-            
-            logger.debug(f"热度评分获取完成，共获取 {len(all_scores)} 条记录")
+        logger.debug(f"热度评分获取完成，共获取 {len(all_scores)} 条记录")
         
         return all_scores
     except Exception as e:
-        logger.error(f"批量获取热度评分失败: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"批量获取热度评分失败: {str(e)}")
+        raise
+
+
+# 热门列表每行由PostgreSQL直接生成JSON对象，跳过ORM对象构建和Python端逐行转换
+# 时间戳在JSON中按ISO 8601格式输出，与isoformat()一致
+_TOP_NEWS_DOC = func.jsonb_build_object(
+    'id', NewsHeatScore.id,
+    'news_id', NewsHeatScore.news_id,
+    'source_id', NewsHeatScore.source_id,
+    'title', NewsHeatScore.title,
+    'url', NewsHeatScore.url,
+    'heat_score', NewsHeatScore.heat_score,
+    'relevance_score', NewsHeatScore.relevance_score,
+    'recency_score', NewsHeatScore.recency_score,
+    'popularity_score', NewsHeatScore.popularity_score,
+    'meta_data', NewsHeatScore.meta_data,
+    'keywords', NewsHeatScore.keywords,
+    'category', NewsHeatScore.category,  # 将分类添加为顶级字段
+    'calculated_at', NewsHeatScore.calculated_at,
+    'published_at', NewsHeatScore.published_at,
+    'updated_at', NewsHeatScore.updated_at,
+    type_=JSONB,
+).label('doc')
+
+
+# 按新闻ID批量取最新一条记录时只取需要的列，不构建ORM对象
+_LATEST_SCORE_VALUES_STMT = _distinct_on_news_id(
+    select(NewsHeatScore.news_id, NewsHeatScore.heat_score)
+    .where(NewsHeatScore.news_id == any_(bindparam("news_ids", type_=ARRAY(String))))
+    .order_by(NewsHeatScore.news_id, desc(NewsHeatScore.calculated_at))
+)
+_LATEST_DOCS_STMT = _distinct_on_news_id(
+    select(NewsHeatScore.news_id, _TOP_NEWS_DOC)
+    .where(NewsHeatScore.news_id == any_(bindparam("news_ids", type_=ARRAY(String))))
+    .order_by(NewsHeatScore.news_id, desc(NewsHeatScore.calculated_at))
+)
+
+
+async def get_latest_scores_by_news_ids(
+    db: AsyncSession, news_ids: List[str]
+) -> Dict[str, float]:
+    """Get the latest heat score value for each news item."""
+    try:
+        if not news_ids:
+            return {}
+        
+        result = await db.execute(_LATEST_SCORE_VALUES_STMT, {"news_ids": list(news_ids)})
+        return dict(result.tuples().all())
+    except Exception as e:
+        logger.exception(f"批量获取热度分数失败: {str(e)}")
         raise
 
 
+async def get_latest_docs_by_news_ids(
+    db: AsyncSession, news_ids: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """Get the latest heat score for each news item as a JSON-ready dict."""
+    try:
+        if not news_ids:
+            return {}
+        
+        # 与热门列表一样由PostgreSQL生成字典，跳过逐行to_dict()
+        result = await db.execute(_LATEST_DOCS_STMT, {"news_ids": list(news_ids)})
+        return dict(result.tuples().all())
+    except Exception as e:
+        logger.exception(f"批量获取详细热度数据失败: {str(e)}")
+        raise
+
+
+def _top_scores_stmt(
+    entity: Any,
+    *,
+    limit: int,
+    skip: int,
+    min_score: Optional[float],
+    max_age_hours: Optional[int],
+    cursor_heat: Optional[float],
+    cursor_id: Optional[uuid.UUID],
+    category: Optional[str] = None,
+) -> Select:
+    """Build the filtered, heat-ordered query shared by the top score getters."""
+    # 构建查询
+    stmt = select(entity)
+    
+    # 应用过滤条件
+    if max_age_hours is not None:
+        # 先获取带时区的时间
+        min_time_with_tz = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+        # 移除时区信息，保留UTC时间值，因为数据库字段是TIMESTAMP WITHOUT TIME ZONE
+        min_time = min_time_with_tz.replace(tzinfo=None)
+        stmt = stmt.where(NewsHeatScore.published_at >= min_time)
+    
+    if min_score is not None:
+        stmt = stmt.where(NewsHeatScore.heat_score >= min_score)
+    
+    # 按分类筛选
+    if category is not None:
+        # 检查是否有多个分类（逗号分隔）
+        categories = [cat.strip() for cat in category.split(',') if cat.strip()]
+        
+        if categories:
+            # 使用冗余的category列，可走 (category, heat_score DESC) 索引；多分类用一个IN条件代替OR链
+            stmt = stmt.where(NewsHeatScore.category.in_(categories))
+    
+    # 游标分页：从上一页最后一条的 (heat_score, id) 之后继续，避免深分页时OFFSET扫描丢弃大量行
+    if cursor_heat is not None and cursor_id is not None:
+        stmt = stmt.where(
+            tuple_(NewsHeatScore.heat_score, NewsHeatScore.id) < tuple_(cursor_heat, cursor_id)
+        )
+    
+    # 应用排序和分页，id作为同分时的稳定排序依据
+    stmt = stmt.order_by(desc(NewsHeatScore.heat_score), desc(NewsHeatScore.id))
+    
+    # 兼容旧的OFFSET分页
+    if skip:
+        stmt = stmt.offset(skip)
+    
+    if limit:
+        stmt = stmt.limit(limit)
+    
+    return stmt
+
+
 async def get_top_heat_scores(
     db: AsyncSession, 
     limit: int = 50, 
     skip: int = 0,
     min_score: Optional[float] = None,
     max_age_hours: Optional[int] = 72,
+    category: Optional[str] = None,
+    *,
+    cursor_heat: Optional[float] = None,
+    cursor_id: Optional[uuid.UUID] = None,
+    load_columns: Optional[Sequence[Any]] = None,
 ) -> List[NewsHeatScore]:
-    """Get top heat scores within the specified time window."""
+    """Get top heat scores within the specified time window.
+    
+    Pass the ``heat_score`` and ``id`` of the last item of the previous page as
+    ``cursor_heat``/``cursor_id`` to fetch the next page without OFFSET.
+    
+    ``load_columns`` restricts the loaded attributes; touching any other
+    attribute raises instead of issuing a per-row SELECT.
+    """
     try:
-        # 构建查询
-        stmt = select(NewsHeatScore)
-        
-        # 应用过滤条件
-        if max_age_hours is not None:
-            # 先获取带时区的时间
-            min_time_with_tz = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-            # 移除时区信息，保留UTC时间值，因为数据库字段是TIMESTAMP WITHOUT TIME ZONE
-            min_time = min_time_with_tz.replace(tzinfo=None)
-            stmt = stmt.where(NewsHeatScore.published_at >= min_time)
-        
-        if min_score is not None:
-            stmt = stmt.where(NewsHeatScore.heat_score >= min_score)
-        
-        # 应用排序和分页
-        stmt = stmt.order_by(desc(NewsHeatScore.heat_score))
-        
-        if skip:
-            stmt = stmt.offset(skip)
-        
-        if limit:
-            stmt = stmt.limit(limit)
-        
-        # 执行查询
+        stmt = _top_scores_stmt(
+            NewsHeatScore,
+            limit=limit,
+            skip=skip,
+            min_score=min_score,
+            max_age_hours=max_age_hours,
+            cursor_heat=cursor_heat,
+            cursor_id=cursor_id,
+            category=category,
+        )
+        if load_columns:
+            stmt = stmt.options(load_only(*load_columns, raiseload=True))
         result = await db.execute(stmt)
-        
-        # 使用同步方式处理结果集
-        scores = []
-        for row in result.scalars():
-            scores.append(row)
-        
-        return scores
+        return list(result.scalars().all())
     except Exception as e:
-        logger.error(f"获取热门评分新闻列表失败: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"获取热门评分新闻列表失败: {str(e)}")
         raise
 
 
@@ -190,91 +326,30 @@ async def get_top_news_as_dict(
     min_score: Optional[float] = None,
     max_age_hours: Optional[int] = 72,
     category: Optional[str] = None,
+    *,
+    cursor_heat: Optional[float] = None,
+    cursor_id: Optional[uuid.UUID] = None,
 ) -> List[Dict[str, Any]]:
-    """获取热门新闻列表作为字典列表"""
+    """获取热门新闻列表作为字典列表
+    
+    下一页可传入上一页最后一条的 heat_score 和 id 作为 cursor_heat/cursor_id
+    """
     try:
-        # 构建查询
-        stmt = select(NewsHeatScore)
-        
-        # 应用过滤条件
-        if max_age_hours is not None:
-            # 先获取带时区的时间
-            min_time_with_tz = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-            # 移除时区信息，保留UTC时间值，因为数据库字段是TIMESTAMP WITHOUT TIME ZONE
-            min_time = min_time_with_tz.replace(tzinfo=None)
-            stmt = stmt.where(NewsHeatScore.published_at >= min_time)
-        
-        if min_score is not None:
-            stmt = stmt.where(NewsHeatScore.heat_score >= min_score)
-            
-        # 按分类筛选
-        if category is not None:
-            # 检查是否有多个分类（逗号分隔）
-            categories = [cat.strip() for cat in category.split(',') if cat.strip()]
-            
-            if len(categories) == 1:
-                # 单分类情况
-                stmt = stmt.where(
-                    NewsHeatScore.meta_data.isnot(None),
-                    NewsHeatScore.meta_data.cast(JSONB).op('->')('category').astext == categories[0]
-                )
-            elif len(categories) > 1:
-                # 多分类情况 - 使用OR条件
-                category_conditions = []
-                for cat in categories:
-                    category_conditions.append(
-                        NewsHeatScore.meta_data.cast(JSONB).op('->')('category').astext == cat
-                    )
-                
-                stmt = stmt.where(
-                    NewsHeatScore.meta_data.isnot(None),
-                    or_(*category_conditions)
-                )
-        
-        # 应用排序和分页
-        stmt = stmt.order_by(desc(NewsHeatScore.heat_score))
-        
-        if skip:
-            stmt = stmt.offset(skip)
-        
-        if limit:
-            stmt = stmt.limit(limit)
-        
-        # 执行查询
+        stmt = _top_scores_stmt(
+            _TOP_NEWS_DOC,
+            limit=limit,
+            skip=skip,
+            min_score=min_score,
+            max_age_hours=max_age_hours,
+            cursor_heat=cursor_heat,
+            cursor_id=cursor_id,
+            category=category,
+        )
         result = await db.execute(stmt)
-        
-        # 获取结果并转换为字典列表
-        news_list = []
-        for row in result.scalars().all():
-            # 提取分类信息
-            category = None
-            if row.meta_data and isinstance(row.meta_data, dict):
-                category = row.meta_data.get('category')
-            
-            item_dict = {
-                "id": row.id,
-                "news_id": row.news_id,
-                "source_id": row.source_id,
-                "title": row.title,
-                "url": row.url,
-                "heat_score": row.heat_score,
-                "relevance_score": row.relevance_score,
-                "recency_score": row.recency_score,
-                "popularity_score": row.popularity_score,
-                "meta_data": row.meta_data,
-                "keywords": row.keywords,
-                "category": category,  # 将分类添加为顶级字段
-                "calculated_at": row.calculated_at.isoformat() if row.calculated_at else None,
-                "published_at": row.published_at.isoformat() if row.published_at else None,
-                "updated_at": row.updated_at.isoformat() if row.updated_at else None
-            }
-            news_list.append(item_dict)
-        
-        return news_list
+        # 每行已是字典
+        return list(result.scalars().all())
     except Exception as e:
-        logger.error(f"获取热门新闻列表失败: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"获取热门新闻列表失败: {str(e)}")
         raise
 
 
@@ -287,44 +362,46 @@ async def update(
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
-    # 处理时区问题 - 更新时间设置为无时区的UTC时间
-    now_with_tz = datetime.now(timezone.utc)
-    update_data["updated_at"] = now_with_tz.replace(tzinfo=None)
+    # updated_at由数据库触发器刷新
+    
+    # 如果更新中包含带时区的published_at，转换为无时区的UTC时间
+    if "published_at" in update_data:
+        update_data["published_at"] = _to_naive_utc(update_data["published_at"])
     
-    # 如果更新中包含published_at且有时区，移除时区信息
-    if "published_at" in update_data and update_data["published_at"] and hasattr(update_data["published_at"], "tzinfo") and update_data["published_at"].tzinfo is not None:
-        update_data["published_at"] = update_data["published_at"].replace(tzinfo=None)
+    # meta_data中的分类变化时同步冗余的分类列
+    if isinstance(update_data.get("meta_data"), dict) and "category" in update_data["meta_data"]:
+        update_data["category"] = update_data["meta_data"]["category"]
     
-    # 更新属性
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
+    if not update_data:
+        return db_obj
     
     try:
+        # UPDATE ... RETURNING 同时带回触发器刷新的updated_at，并更新会话中的db_obj
+        stmt = (
+            sql_update(NewsHeatScore)
+            .where(NewsHeatScore.id == db_obj.id)
+            .values(**update_data)
+            .returning(NewsHeatScore)
+        )
+        result = await db.scalars(stmt)
+        db_obj = result.one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     except Exception as e:
         await db.rollback()
-        logger.error(f"更新热度评分失败: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"更新热度评分失败: {e}")
         raise
 
 
-async def delete(db: AsyncSession, id: str) -> bool:
+async def delete(db: AsyncSession, id: uuid.UUID) -> bool:
     """Delete a heat score."""
     try:
-        result = await db.execute(select(NewsHeatScore).where(NewsHeatScore.id == id))
-        # 使用同步方式获取第一个结果
-        obj = result.scalars().first()
-        if not obj:
-            return False
-        
-        await db.delete(obj)
+        # 一条 DELETE ... RETURNING 完成查询和删除，无需先加载对象
+        result = await db.execute(_DELETE_BY_ID_STMT, {"id": id})
+        deleted_id = result.scalar_one_or_none()
         await db.commit()
-        return True
+        return deleted_id is not None
     except Exception as e:
-        logger.error(f"删除热度评分失败 (ID: {id}): {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        await db.rollback()
+        logger.exception(f"删除热度评分失败 (ID: {id}): {str(e)}")
         raise 
\ No newline at end of file
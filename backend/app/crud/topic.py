@@ -4,7 +4,8 @@ CRUD operations for Topic model.
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import Select
 
 from app.crud.base import CRUDBase
@@ -15,6 +16,18 @@ from app.schemas.topic import TopicCreate, TopicUpdate
 class CRUDTopic(CRUDBase[Topic, TopicCreate, TopicUpdate]):
     """CRUD operations for Topic model."""
     
+    async def get_with_suggestions(self, db: AsyncSession, *, id: int) -> Optional[Topic]:
+        """
+        Get a topic with its content suggestions loaded in the same round trip.
+        """
+        stmt = (
+            select(self.model)
+            .where(self.model.id == id)
+            .options(selectinload(self.model.suggestions))
+        )
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+    
     async def get_by_category(self, db: AsyncSession, *, category: str, skip: int = 0, limit: int = 100) -> List[Topic]:
         """
         Get topics by category.
@@ -46,36 +59,79 @@ class CRUDTopic(CRUDBase[Topic, TopicCreate, TopicUpdate]):
         *, 
         category: Optional[str] = None, 
         page: int = 1, 
-        page_size: int = 20
+        page_size: int = 20,
+        cursor_heat: Optional[float] = None,
+        cursor_id: Optional[int] = None,
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         """
         Get topics by category with pagination.
-        """
-        skip = (page - 1) * page_size
         
-        # Base query
-        stmt = select(self.model)
+        Pass the ``next_cursor`` of the previous page as ``cursor_heat``/``cursor_id``
+        to seek directly to the next page; otherwise ``page`` is used as an offset.
+        Set ``include_total=False`` to leave ``total`` empty; on the offset path
+        the total is read from the page query itself.
+        """
+        filters = [self.model.category == category] if category else []
+        ordering = (self.model.heat.desc(), self.model.id.desc())
+        total = None
         
-        # Apply category filter if provided
-        if category:
-            stmt = stmt.where(self.model.category == category)
+        if cursor_heat is not None and cursor_id is not None:
+            # Keyset pagination: only reads the rows of the requested page
+            paginated_stmt = (
+                select(self.model)
+                .where(*filters)
+                .where(tuple_(self.model.heat, self.model.id) < tuple_(cursor_heat, cursor_id))
+                .order_by(*ordering)
+                .limit(page_size)
+            )
+            result = await db.execute(paginated_stmt)
+            items = list(result.scalars().all())
+        else:
+            # Deferred join: sort and skip over ids only, then load the full rows of the page.
+            # count(*) OVER () is evaluated before OFFSET/LIMIT, so the total comes back
+            # with the page instead of needing a separate count query.
+            skip = (page - 1) * page_size
+            page_ids = (
+                select(self.model.id, func.count().over().label("_total"))
+                .where(*filters)
+                .order_by(*ordering)
+                .offset(skip)
+                .limit(page_size)
+                .subquery()
+            )
+            paginated_stmt = (
+                select(self.model, page_ids.c._total)
+                .join(page_ids, page_ids.c.id == self.model.id)
+                .order_by(*ordering)
+            )
+            result = await db.execute(paginated_stmt)
+            rows = result.all()
+            items = [row[0] for row in rows]
+            if rows:
+                total = rows[0]._total
+            elif skip == 0:
+                total = 0
         
-        # Get total count
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total_result = await db.execute(count_stmt)
-        total = total_result.scalar()
+        if not include_total:
+            total = None
+        elif total is None:
+            # Keyset pages and pages past the end don't carry the window total
+            count_stmt = select(func.count()).select_from(self.model).where(*filters)
+            total_result = await db.execute(count_stmt)
+            total = total_result.scalar()
         
-        # Get paginated items
-        paginated_stmt = stmt.order_by(self.model.heat.desc()).offset(skip).limit(page_size)
-        result = await db.execute(paginated_stmt)
-        items = list(result.scalars().all())
+        # heat为空的行无法参与 (heat, id) 比较，此时不返回游标，继续按page翻页
+        next_cursor = None
+        if len(items) == page_size and items[-1].heat is not None:
+            next_cursor = {"heat": items[-1].heat, "id": items[-1].id}
         
         return {
             "items": items,
             "total": total,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor,
         }
 
-
 topic = CRUDTopic(Topic) 
\ No newline at end of file
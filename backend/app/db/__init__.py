@@ -4,5 +4,5 @@ Database package initialization.
 This module contains all the database related code.
 """
 
-from .session import Base, SessionLocal, engine
+from .session import Base, SessionLocal, BackgroundSessionLocal, engine
 from .init_db import init_db
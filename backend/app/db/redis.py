@@ -1,84 +1,223 @@
+import asyncio
+import datetime
+import enum
+import fnmatch
+import heapq
 import json
-from typing import Any, Dict, Optional, Union
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
 
 try:
-    import aioredis
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    # redis v4.2.0+ 自带异步API（aioredis已并入redis-py），优先使用
+    from redis.asyncio import ConnectionPool, Redis
     REDIS_AVAILABLE = True
 except ImportError:
     try:
-        from redis.asyncio import Redis
+        # 兼容只安装了独立aioredis包的旧环境；aioredis 2.x在Python 3.11+上导入时会抛出TypeError
+        from aioredis import ConnectionPool, Redis
         REDIS_AVAILABLE = True
-        # 兼容旧版代码，redis v4.2.0+也支持异步API
-        aioredis = Redis
-    except ImportError:
+    except (ImportError, TypeError):
         logger.warning("Redis异步库不可用，使用内存缓存作为备选")
         REDIS_AVAILABLE = False
 
 # 简单的内存缓存实现，作为Redis不可用时的备选
 class MemoryCache:
     def __init__(self):
-        self._cache = {}
-        self._expires = {}
-        import time
-        self.time = time
+        # key -> (value, 过期时间)，过期时间为None表示永不过期；使用单调时钟，不受系统时间调整影响
+        self._store: Dict[str, Tuple[Any, Optional[float]]] = {}
+        # (过期时间, key) 最小堆，写入时顺带清理已过期的键，避免过期数据无限堆积
+        self._heap: List[Tuple[float, str]] = []
+        # 键集合快照，只在增删键时失效，监控接口频繁调用keys()时无需每次重建
+        self._key_snapshot: Optional[Tuple[str, ...]] = None
+    
+    def _purge_expired(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expire_at, key = heapq.heappop(heap)
+            entry = self._store.get(key)
+            # 键被重新设置后堆中会残留旧条目，只删除过期时间一致的
+            if entry is not None and entry[1] == expire_at:
+                del self._store[key]
+                self._key_snapshot = None
     
     async def ping(self):
         return True
         
     async def get(self, key):
-        if key in self._expires and self._expires[key] < self.time.time():
-            del self._cache[key]
-            del self._expires[key]
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        value, expire_at = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._store[key]
+            self._key_snapshot = None
             return None
-        return self._cache.get(key)
+        return value
     
     async def set(self, key, value, ex=None):
-        self._cache[key] = value
+        now = time.monotonic()
+        self._purge_expired(now)
         if ex:
-            self._expires[key] = self.time.time() + ex
+            expire_at = now + ex
+            heapq.heappush(self._heap, (expire_at, key))
+        else:
+            expire_at = None
+        if key not in self._store:
+            self._key_snapshot = None
+        self._store[key] = (value, expire_at)
         return True
     
     async def setex(self, key, ex, value):
         return await self.set(key, value, ex)
+    
+    async def mget(self, keys):
+        return [await self.get(key) for key in keys]
         
     async def delete(self, *keys):
         count = 0
         for key in keys:
-            if key in self._cache:
-                del self._cache[key]
-                if key in self._expires:
-                    del self._expires[key]
+            if self._store.pop(key, None) is not None:
                 count += 1
+        if count:
+            self._key_snapshot = None
         return count
     
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+    
     async def exists(self, key):
-        return key in self._cache
+        return await self.get(key) is not None
+        
+    async def scan_iter(self, match="*", count=None):
+        for key in await self.keys(match):
+            yield key
         
     async def keys(self, pattern="*"):
-        # 简单实现，不支持模式匹配
-        return list(self._cache.keys())
+        # 与Redis KEYS一致的glob匹配，避免调用方拿到无关的键
+        self._purge_expired(time.monotonic())
+        if self._key_snapshot is None:
+            self._key_snapshot = tuple(self._store)
+        if pattern == "*":
+            return self._key_snapshot
+        return fnmatch.filter(self._key_snapshot, pattern)
         
     async def dbsize(self):
-        return len(self._cache)
+        self._purge_expired(time.monotonic())
+        return len(self._store)
         
     async def close(self):
-        self._cache.clear()
-        self._expires.clear()
+        self._store.clear()
+        self._heap.clear()
+        self._key_snapshot = None
+
+
+def _json_default(obj: Any) -> Any:
+    # orjson不直接支持集合类型，与原先json.dumps之前的处理保持一致
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # msgpack没有日期类型，与orjson一样存为ISO格式字符串
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    # NewsHeatScore等模型的主键是UUID，存为字符串
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    # Decimal与原先的jsonable_encoder一样：整数值存为int，其余存为float
+    if isinstance(obj, Decimal):
+        exponent = obj.as_tuple().exponent
+        return int(obj) if isinstance(exponent, int) and exponent >= 0 else float(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+if orjson is not None:
+    def _dumps(value: Any) -> bytes:
+        # OPT_NON_STR_KEYS：与json.dumps一样允许非字符串的字典键
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+    _DECODE_ERRORS = (orjson.JSONDecodeError, TypeError)
+else:
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, default=_json_default)
+
+    _loads = json.loads
+    _DECODE_ERRORS = (json.JSONDecodeError, TypeError)
+
+
+# msgpack编码的值以0xC1开头：该字节在msgpack中保留未用，也不会出现在UTF-8文本开头，
+# 因此可以和此前写入的JSON值区分开，升级后旧缓存仍能正常读取
+_MSGPACK_MARKER = b"\xc1"
+
+
+def _serialize(value: Any) -> Union[bytes, str]:
+    """Encode a cache value; msgpack when available, JSON otherwise."""
+    if msgpack is not None:
+        return _MSGPACK_MARKER + msgpack.packb(value, use_bin_type=True, default=_json_default)
+    return _dumps(value)
+
+
+def _deserialize(data: Union[bytes, str]) -> Any:
+    """Decode a value written by _serialize (or a legacy JSON value)."""
+    if isinstance(data, bytes) and data[:1] == _MSGPACK_MARKER and msgpack is not None:
+        return msgpack.unpackb(data[1:], raw=False, strict_map_key=False)
+    try:
+        return _loads(data)
+    except _DECODE_ERRORS:
+        return data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+
+
+# 连接池默认参数：限制连接总数，并通过TCP keepalive与定期健康检查复用长连接
+DEFAULT_POOL_SIZE = 50
+HEALTH_CHECK_INTERVAL = 30
+# SCAN每批返回的键数量提示
+SCAN_COUNT = 500
+
 
 # 简化的Redis连接管理器
 class RedisManager:
     """Redis connection manager."""
 
-    def __init__(self, url: str = "redis://localhost:6379/0"):
+    def __init__(self, url: str = "redis://localhost:6379/0", pool_size: int = DEFAULT_POOL_SIZE):
         self.redis_url = url
+        self.pool_size = pool_size
+        self.pool = None
         self.redis_client = None
         self.is_connected = False
         self.using_memory_cache = False
+        # 只在尚未连接时使用，保证并发调用者共享同一个客户端
+        self._connect_lock = asyncio.Lock()
+
+    async def _ensure_client(self):
+        """Connect on first use; concurrent callers wait for the same connection."""
+        async with self._connect_lock:
+            if self.redis_client is None:
+                await self._connect()
+        return self.redis_client
 
     async def connect(self) -> None:
         """Connect to Redis."""
+        # 加锁后再次检查，并发调用时只会建立一个客户端和连接池，不会泄漏多余的连接
+        async with self._connect_lock:
+            if self.redis_client is not None:
+                return
+            await self._connect()
+
+    async def _connect(self) -> None:
         if not REDIS_AVAILABLE:
             logger.warning("Redis不可用，使用内存缓存")
             self.redis_client = MemoryCache()
@@ -86,21 +225,31 @@ class RedisManager:
             self.using_memory_cache = True
             return
 
+        pool = None
         try:
-            self.redis_client = aioredis.from_url(
+            # 显式创建共享连接池，避免默认连接池在并发请求下无限制地新建连接
+            pool = ConnectionPool.from_url(
                 self.redis_url,
+                max_connections=self.pool_size,
+                socket_keepalive=True,
+                health_check_interval=HEALTH_CHECK_INTERVAL,
+                # 值是二进制的msgpack数据，不能按UTF-8解码；键在iter_keys中单独解码
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=False
             )
+            client = Redis(connection_pool=pool)
             
-            # 测试连接
-            if hasattr(self.redis_client, "ping"):
-                await self.redis_client.ping()
+            # 测试连接，成功后才对外可见
+            await client.ping()
             
+            self.pool = pool
+            self.redis_client = client
             self.is_connected = True
-            logger.info("已连接到Redis")
+            logger.info(f"已连接到Redis (连接池上限: {self.pool_size})")
         except Exception as e:
-            logger.error(f"Redis连接失败: {e}")
+            if pool is not None:
+                await pool.disconnect()
+            logger.error("Redis连接失败: {}", e)
             logger.warning("使用内存缓存作为备选")
             self.redis_client = MemoryCache()
             self.is_connected = True
@@ -111,115 +260,210 @@ class RedisManager:
         if self.redis_client:
             if hasattr(self.redis_client, "close"):
                 await self.redis_client.close()
+            # 显式传入的连接池不会随客户端关闭，需要单独断开
+            if self.pool is not None:
+                await self.pool.disconnect()
+                self.pool = None
+            self.redis_client = None
             self.is_connected = False
             logger.info("已断开Redis连接")
 
     async def get(self, key: str) -> Optional[Any]:
         """Get a value from Redis by key."""
-        if not self.is_connected or not self.redis_client:
-            await self.connect()
-            if not self.is_connected:
-                return None
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
 
         try:
-            data = await self.redis_client.get(key)
+            data = await client.get(key)
             if data:
-                try:
-                    return json.loads(data)
-                except (json.JSONDecodeError, TypeError):
-                    return data
+                return _deserialize(data)
             return None
         except Exception as e:
-            logger.error(f"Redis获取错误: {e}")
+            logger.error("Redis获取错误: {}", e)
             return None
 
     async def set(
         self, key: str, value: Any, expire: Optional[int] = None
     ) -> bool:
         """Set a value in Redis."""
-        if not self.is_connected or not self.redis_client:
-            await self.connect()
-            if not self.is_connected:
-                return False
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
 
         try:
-            # 序列化复杂类型
-            if isinstance(value, (dict, list, tuple, set)):
-                serialized_value = json.dumps(value)
-            else:
-                serialized_value = value
+            # 统一序列化（优先msgpack，否则JSON），get时原样还原类型
+            serialized_value = _serialize(value)
                 
             if expire:
-                await self.redis_client.setex(key, expire, serialized_value)
+                await client.setex(key, expire, serialized_value)
             else:
-                await self.redis_client.set(key, serialized_value)
+                await client.set(key, serialized_value)
             return True
         except Exception as e:
-            logger.error(f"Redis设置错误: {e}")
+            logger.error("Redis设置错误: {}", e)
+            return False
+
+    async def set_raw(
+        self, key: str, data: bytes, expire: Optional[int] = None
+    ) -> bool:
+        """Store already JSON-encoded bytes as-is; get() decodes them as JSON."""
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
+
+        try:
+            if expire:
+                await client.setex(key, expire, data)
+            else:
+                await client.set(key, data)
+            return True
+        except Exception as e:
+            logger.error("Redis设置错误: {}", e)
+            return False
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip; missing keys yield None."""
+        if not keys:
+            return []
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
+
+        try:
+            return [
+                _deserialize(data) if data else None
+                for data in await client.mget(keys)
+            ]
+        except Exception as e:
+            logger.error("Redis批量获取错误: {}", e)
+            return [None] * len(keys)
+
+    async def mset(
+        self, mapping: Dict[str, Any], expire: Optional[int] = None
+    ) -> bool:
+        """Set several values in one round trip, each with the same expiry."""
+        if not mapping:
+            return True
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
+
+        try:
+            if self.using_memory_cache:
+                for key, value in mapping.items():
+                    await client.set(key, _serialize(value), ex=expire)
+                return True
+            # 非事务管道：所有命令一次发送，只需一次网络往返
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, _serialize(value), ex=expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Redis批量设置错误: {}", e)
             return False
 
     async def delete(self, *keys) -> bool:
         """Delete keys from Redis."""
-        if not self.is_connected or not self.redis_client:
-            await self.connect()
-            if not self.is_connected:
-                return False
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
 
         try:
             if keys:
-                await self.redis_client.delete(*keys)
+                await client.delete(*keys)
             return True
         except Exception as e:
-            logger.error(f"Redis删除错误: {e}")
+            logger.error("Redis删除错误: {}", e)
             return False
 
     async def exists(self, key: str) -> bool:
         """Check if a key exists in Redis."""
-        if not self.is_connected or not self.redis_client:
-            await self.connect()
-            if not self.is_connected:
-                return False
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
 
         try:
-            result = await self.redis_client.exists(key)
+            result = await client.exists(key)
             return bool(result)
         except Exception as e:
-            logger.error(f"Redis检查错误: {e}")
+            logger.error("Redis检查错误: {}", e)
             return False
             
+    async def iter_keys(self, pattern: str, count: int = SCAN_COUNT) -> AsyncIterator[str]:
+        """Iterate over keys matching pattern with SCAN; errors propagate to the caller."""
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
+
+        # SCAN分批遍历，不会像KEYS那样长时间阻塞Redis服务端
+        async for key in client.scan_iter(match=pattern, count=count):
+            yield key.decode("utf-8") if isinstance(key, bytes) else key
+
+    async def delete_pattern(self, pattern: str, count: int = SCAN_COUNT) -> int:
+        """Delete keys matching pattern with SCAN + UNLINK; errors propagate to the caller."""
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
+
+        # 每凑满一批就UNLINK：既不用KEYS阻塞服务端，也不用在内存中攒下全部键；
+        # UNLINK在后台线程释放内存，不会像DEL那样阻塞
+        deleted = 0
+        batch = []
+        async for key in client.scan_iter(match=pattern, count=count):
+            batch.append(key)
+            if len(batch) >= count:
+                await client.unlink(*batch)
+                deleted += len(batch)
+                batch = []
+        if batch:
+            await client.unlink(*batch)
+            deleted += len(batch)
+        return deleted
+
     async def keys(self, pattern: str) -> list:
         """Get keys matching pattern."""
-        if not self.is_connected or not self.redis_client:
-            await self.connect()
-            if not self.is_connected:
-                return []
-
         try:
-            return await self.redis_client.keys(pattern)
+            return [key async for key in self.iter_keys(pattern)]
         except Exception as e:
-            logger.error(f"Redis keys错误: {e}")
+            logger.error("Redis keys错误: {}", e)
             return []
     
     async def dbsize(self) -> int:
         """Get database size."""
-        if not self.is_connected or not self.redis_client:
-            await self.connect()
-            if not self.is_connected:
-                return 0
+        client = self.redis_client
+        if client is None:
+            client = await self._ensure_client()
 
         try:
-            return await self.redis_client.dbsize()
+            return await client.dbsize()
         except Exception as e:
-            logger.error(f"Redis dbsize错误: {e}")
+            logger.error("Redis dbsize错误: {}", e)
             return 0
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool usage, for the health endpoint."""
+        if self.pool is None:
+            return {"using_memory_cache": self.using_memory_cache}
+        in_use = len(getattr(self.pool, "_in_use_connections", ()))
+        available = len(getattr(self.pool, "_available_connections", ()))
+        return {
+            "max_connections": self.pool.max_connections,
+            "created_connections": in_use + available,
+            "in_use_connections": in_use,
+            "available_connections": available,
+        }
+
 
 # 创建Redis管理器实例
 try:
     from app.core.config import settings
     redis_url = settings.REDIS_URL
+    redis_pool_size = settings.REDIS_POOL_SIZE
 except (ImportError, AttributeError):
     # 如果无法从settings导入，使用默认URL
     redis_url = "redis://localhost:6379/0"
+    redis_pool_size = DEFAULT_POOL_SIZE
 
-redis_manager = RedisManager(url=redis_url) 
\ No newline at end of file
+redis_manager = RedisManager(url=redis_url, pool_size=redis_pool_size) 
\ No newline at end of file
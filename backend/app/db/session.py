@@ -1,14 +1,65 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
+import asyncio
+import random
+import time
+import zlib
+from contextlib import asynccontextmanager
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncConnection, AsyncSession
+from sqlalchemy.orm import declarative_base
 from fastapi import Depends
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator
 
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 连接池大小（可通过环境变量配置）；启动时预先建立 POOL_WARM_SIZE 个连接，避免冷启动后的首批请求承担建连和认证开销
+POOL_SIZE = settings.DB_POOL_SIZE
+MAX_OVERFLOW = settings.DB_MAX_OVERFLOW
+POOL_WARM_SIZE = min(5, POOL_SIZE)
+
+# asyncpg 连接参数：关闭JIT（短小的OLTP查询编译JIT得不偿失），增大预编译语句缓存
+_CONNECT_ARGS = {
+    "server_settings": {"jit": "off"},
+    "prepared_statement_cache_size": 512,
+}
+
+# Web连接池不做pre-ping（每次取连接都要多一次 SELECT 1 往返），改由服务端TCP keepalive
+# 及早发现并关闭失效的空闲连接；个别仍失效的连接在出错时会被连接池作废，不会再被复用
+_WEB_CONNECT_ARGS = {
+    **_CONNECT_ARGS,
+    "server_settings": {
+        **_CONNECT_ARGS["server_settings"],
+        "tcp_keepalives_idle": "60",
+        "tcp_keepalives_interval": "10",
+        "tcp_keepalives_count": "3",
+    },
+}
+
+# JSON/JSONB 列的编解码：orjson可用时替换标准库json；asyncpg编码器需要str
+if orjson is not None:
+    _JSON_ARGS = {
+        "json_serializer": lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode(),
+        "json_deserializer": orjson.loads,
+    }
+else:
+    _JSON_ARGS = {}
+
 # 创建异步 SQLAlchemy 引擎
 engine = create_async_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=1800,
+    pool_pre_ping=False,
+    connect_args=_WEB_CONNECT_ARGS,
+    **_JSON_ARGS,
     # 只在调试模式下回显SQL语句
     echo=False,  # 完全禁用直接回显，我们通过日志过滤器来控制
     # 禁用参数回显，避免生成大量无用信息
@@ -16,62 +67,135 @@ engine = create_async_engine(
 )
 
 # 创建异步会话类
-SessionLocal = sessionmaker(
+SessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
     engine, 
-    class_=AsyncSession, 
     expire_on_commit=False,
-    autocommit=False, 
     autoflush=False
 )
 
 # 为了兼容性添加别名
 async_session_maker = SessionLocal
 
+# 后台定时任务专用的引擎和连接池，避免长时间运行的任务占满Web请求的连接
+background_engine = create_async_engine(
+    settings.DATABASE_URL,
+    pool_size=4,
+    max_overflow=0,
+    pool_recycle=1800,
+    # 定时任务间隔长、连接空闲久，取连接时的一次探测开销可以忽略，保留pre-ping
+    pool_pre_ping=True,
+    connect_args=_CONNECT_ARGS,
+    **_JSON_ARGS,
+    echo=False,
+    echo_pool=False,
+)
+
+BackgroundSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    background_engine,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 # 创建声明性基类模型
 Base = declarative_base()
 
+# SQL日志：不使用echo（每条语句都要格式化），只记录慢查询和按比例抽样的查询，
+# 且只记录语句哈希、耗时和行数；DEBUG模式下记录全部查询
+SQL_SLOW_QUERY_MS = settings.SQL_SLOW_QUERY_MS
+SQL_LOG_SAMPLE_RATE = 1.0 if settings.DEBUG else settings.SQL_LOG_SAMPLE_RATE
+
+
+# 开始时间记在本次执行的context上：语句出错时不会触发after事件，随context一起丢弃，不会残留在连接上
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_start_time", None)
+    if start_time is None:
+        return
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    slow = duration_ms >= SQL_SLOW_QUERY_MS
+    if not slow and random.random() >= SQL_LOG_SAMPLE_RATE:
+        return
+    
+    # crc32在各进程间稳定，可按哈希聚合同一语句
+    sql_hash = f"{zlib.crc32(statement.encode()):08x}"
+    rows = cursor.rowcount
+    sql_logger = logger.bind(sql_hash=sql_hash, duration_ms=duration_ms, rows=rows)
+    if slow:
+        sql_logger.warning(f"🐢 慢查询 [{sql_hash}] {duration_ms:.1f}ms, {rows} 行: {statement[:200]}")
+    else:
+        sql_logger.info(f"SQL [{sql_hash}] {duration_ms:.1f}ms, {rows} 行")
+
+
+for _engine in (engine, background_engine):
+    event.listen(_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def warm_up_pool(size: int = POOL_WARM_SIZE) -> None:
+    """Open pool connections up front and return them to the pool."""
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)), return_exceptions=True
+    )
+    connections = [r for r in results if isinstance(r, AsyncConnection)]
+    for conn in connections:
+        await conn.close()
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        logger.warning(f"⚠️ 数据库连接池预热部分失败: {errors[0]}")
+    else:
+        logger.info(f"✅ 数据库连接池预热完成，已建立 {len(connections)} 个连接")
+
 
 # 获取数据库会话的依赖函数
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """提供 SQLAlchemy 异步数据库会话的依赖函数。"""
-    async with SessionLocal() as db:
-        try:
-            yield db
-        except Exception:
-            # 出现异常时回滚事务
-            await db.rollback()
-            raise
-        finally:
-            # 确保会话被关闭
-            await db.close()
+    # 不再套一层 async with：finally 中显式关闭，连接在请求结束时立即归还连接池
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        # 出现异常时回滚事务
+        await db.rollback()
+        raise
+    finally:
+        # 确保会话被关闭
+        await db.close()
 
 
 # 提供一个自动提交事务的数据库会话依赖
 async def get_db_auto_commit() -> AsyncGenerator[AsyncSession, None]:
     """提供自动提交事务的 SQLAlchemy 异步数据库会话依赖函数。"""
-    async with SessionLocal() as db:
-        try:
-            yield db
-            # 视图函数成功结束后自动提交事务
-            await db.commit()
-        except Exception:
-            # 出现异常时回滚事务
-            await db.rollback()
-            raise
-        finally:
-            # 确保会话被关闭
-            await db.close()
+    db = SessionLocal()
+    try:
+        yield db
+        # 视图函数成功结束后自动提交事务
+        await db.commit()
+    except Exception:
+        # 出现异常时回滚事务
+        await db.rollback()
+        raise
+    finally:
+        # 确保会话被关闭
+        await db.close()
 
 
 # 创建一个上下文管理器函数，用于后台任务使用
-async def get_session_for_task():
+@asynccontextmanager
+async def get_session_for_task() -> AsyncIterator[AsyncSession]:
     """为后台任务创建独立的数据库会话上下文。"""
-    async with SessionLocal() as session:
-        try:
-            yield session
-            # 确保事务被提交
-            await session.commit()
-        except Exception:
-            # 出现异常时回滚事务
-            await session.rollback()
-            raise 
\ No newline at end of file
+    session = SessionLocal()
+    try:
+        yield session
+        # 确保事务被提交
+        await session.commit()
+    except Exception:
+        # 出现异常时回滚事务
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
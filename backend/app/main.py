@@ -5,15 +5,18 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from loguru import logger
 
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.core.scheduler import scheduler
+from app.core.static_files import PrecomputedStaticFiles
 from app.core.tasks import register_tasks
 from app.db.redis import redis_manager
+from app.db.session import SessionLocal, warm_up_pool
+from app.services.content_service import ContentService
+from app.services.heatlink_client import heatlink_client
 
 # Get the static directory path
 STATIC_DIR = Path(__file__).parent / "static"
@@ -31,6 +34,16 @@ async def lifespan(app: FastAPI):
     # Connect to Redis
     await redis_manager.connect()
     
+    # Pre-open database connections
+    await warm_up_pool()
+    
+    # Load content suggestion templates into memory
+    try:
+        async with SessionLocal() as db:
+            await ContentService.load_content_suggestions(db)
+    except Exception as e:
+        logger.warning(f"⚠️ 内容建议模板预加载失败，将按需查询数据库: {e}")
+    
     # Setup task scheduler
     logger.info("Setting up task scheduler...")
     scheduler.setup(app)
@@ -49,8 +62,14 @@ async def lifespan(app: FastAPI):
     logger.info("Stopping task scheduler...")
     await scheduler.stop()
     
+    # Close pooled HeatLink connections
+    await heatlink_client.aclose()
+    
     # Disconnect from Redis
     await redis_manager.disconnect()
+    
+    # Flush log records queued by enqueue=True sinks
+    await logger.complete()
 
 
 def create_app() -> FastAPI:
@@ -71,6 +90,8 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # 跨域前端需读取热门新闻的下一页游标
+        expose_headers=["X-Next-Cursor-Heat", "X-Next-Cursor-Id"],
     )
     
     # Include API router
@@ -78,7 +99,7 @@ def create_app() -> FastAPI:
     
     # Mount static files
     if os.path.exists(STATIC_DIR):
-        app.mount("/", StaticFiles(directory=STATIC_DIR), name="static")
+        app.mount("/", PrecomputedStaticFiles(directory=STATIC_DIR, html=False, check_dir=False), name="static")
     
     return app
 
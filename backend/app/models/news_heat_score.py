@@ -1,9 +1,8 @@
-import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
-from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, Index, FetchedValue, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.db.session import Base
 
@@ -14,27 +13,39 @@ class NewsHeatScore(Base):
     Stores calculation results of the news heat score system.
     """
     __tablename__ = "news_heat_scores"
+    # INSERT/UPDATE通过RETURNING带回数据库生成的id和时间戳，异步会话中读取时无需再次加载
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    news_id = Column(String, index=True, nullable=False)
-    source_id = Column(String, index=True, nullable=False)
+    # 主键由数据库生成（gen_random_uuid），原生UUID类型只占16字节
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    news_id = Column(String, nullable=False)
+    source_id = Column(String, nullable=False)
     title = Column(String, nullable=False)
     url = Column(String, nullable=False)
     
     # Heat score values
-    heat_score = Column(Float, nullable=False, index=True)
+    heat_score = Column(Float, nullable=False)
     relevance_score = Column(Float)  # 关键词匹配度得分
     recency_score = Column(Float)    # 时效性得分
     popularity_score = Column(Float) # 原平台热度得分
     
     # Additional metadata
-    meta_data = Column(JSON, nullable=True)  # 存储跨源频率得分、来源权重等额外信息
-    keywords = Column(JSON, nullable=True)   # 提取的关键词列表
+    meta_data = Column(JSONB, nullable=True)  # 存储跨源频率得分、来源权重等额外信息
+    keywords = Column(JSONB, nullable=True)   # 提取的关键词列表
+    category = Column(String(64), nullable=True)  # 冗余自meta_data中的category，用于按分类筛选
     
     # Timestamps
-    calculated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # calculated_at/updated_at由数据库设置（UTC，无时区），updated_at在更新时由触发器刷新
+    calculated_at = Column(DateTime, server_default=text("(now() AT TIME ZONE 'utc')"))
     published_at = Column(DateTime, nullable=False, index=True)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, server_default=text("(now() AT TIME ZONE 'utc')"), server_onupdate=FetchedValue())
+
+    # 与 migrations 中的索引保持一致：按新闻取最新记录、热度排序（含游标分页）、按分类筛选
+    __table_args__ = (
+        Index("idx_news_heat_scores_news_id_calculated_at", news_id, calculated_at.desc()),
+        Index("idx_news_heat_scores_heat_score_id", heat_score.desc(), id.desc()),
+        Index("idx_news_heat_scores_category_heat", category, heat_score.desc(), published_at),
+    )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary."""
@@ -4,16 +4,23 @@ Topic related data models.
 
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
+from app.core.config import settings
 from app.db.session import Base
 
+# created_at/updated_at由数据库生成（UTC，无时区），INSERT/UPDATE时不再由Python取时间
+_UTC_NOW = text("(now() AT TIME ZONE 'utc')")
+
 
 class Topic(Base):
     """Topic model for storing hot topics data."""
     
     __tablename__ = "topics"
+    # 数据库生成的时间戳随 INSERT/UPDATE ... RETURNING 带回，避免提交后再查询
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -24,12 +31,18 @@ class Topic(Base):
     url = Column(String(512), nullable=True)
     image_url = Column(String(512), nullable=True)
     heat = Column(Float, default=0)
-    extra = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    extra = Column(JSONB, nullable=True)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
+    updated_at = Column(DateTime, server_default=_UTC_NOW, onupdate=_UTC_NOW)
     
     # Relationship with ContentSuggestion
-    suggestions = relationship("ContentSuggestion", back_populates="topic", cascade="all, delete-orphan")
+    # 异步会话中不能隐式懒加载；调试模式下直接报错，强制调用方使用 selectinload 显式加载
+    suggestions = relationship(
+        "ContentSuggestion",
+        back_populates="topic",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql" if settings.DEBUG else "select",
+    )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary."""
@@ -55,6 +68,7 @@ class ContentSuggestion(Base):
     """Content suggestions model for storing template suggestions based on topic categories."""
     
     __tablename__ = "content_suggestions"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     topic_id = Column(Integer, ForeignKey("topics.id"), nullable=True)
@@ -62,8 +76,8 @@ class ContentSuggestion(Base):
     suggestion_type = Column(String(50), nullable=False)  # title, outline, keyPoint, introduction
     content = Column(Text, nullable=False)
     position = Column(Integer, default=0)  # For ordering within a category
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
+    updated_at = Column(DateTime, server_default=_UTC_NOW, onupdate=_UTC_NOW)
     
     # Relationship with Topic
     topic = relationship("Topic", back_populates="suggestions")
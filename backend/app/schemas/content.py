@@ -4,7 +4,7 @@ Pydantic schemas for Content Suggestion models.
 
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ContentSuggestionBase(BaseModel):
@@ -27,8 +27,7 @@ class ContentSuggestionResponse(ContentSuggestionBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GeneratedContent(BaseModel):
@@ -36,4 +35,10 @@ class GeneratedContent(BaseModel):
     title_suggestions: List[str]
     outline: List[str]
     key_points: List[str]
-    introduction: str 
\ No newline at end of file
+    introduction: str 
+
+
+class GeneratedContentBatch(BaseModel):
+    """Schema for batch generated content response."""
+    contents: Dict[int, GeneratedContent] = Field(default_factory=dict)
+    not_found: List[int] = Field(default_factory=list)
@@ -1,7 +1,8 @@
+import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class KeywordBase(BaseModel):
@@ -44,10 +45,9 @@ class HeatScoreCreate(BaseModel):
 
 class HeatScoreResponse(HeatScoreBase):
     """Model for heat score response."""
-    id: str
+    id: uuid.UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class HeatScoreUpdate(BaseModel):
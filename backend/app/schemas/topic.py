@@ -4,7 +4,7 @@ Pydantic schemas for Topic models.
 
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class TopicBase(BaseModel):
@@ -45,13 +45,19 @@ class TopicResponse(TopicBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TopicCursor(BaseModel):
+    """Keyset cursor pointing at the last topic of a page."""
+    heat: float
+    id: int
 
 
 class TopicList(BaseModel):
     """Schema for list of topics."""
     items: List[TopicResponse]
-    total: int
+    total: Optional[int] = None
     page: int = 1
-    page_size: int = 20 
\ No newline at end of file
+    page_size: int = 20
+    next_cursor: Optional[TopicCursor] = None 
\ No newline at end of file
@@ -2,18 +2,218 @@
 Service for handling content generation and related operations.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+import time
+import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from loguru import logger
 
+from app.core.config import settings
+from app.crud.content_suggestion import content_suggestion
+from app.db.redis import redis_manager
 from app.models.topic import Topic, ContentSuggestion
-from app.schemas.content import GeneratedContent
+from app.schemas.content import ContentSuggestionBase, ContentSuggestionCreate, GeneratedContent
+
+# 内容建议按分类缓存在Redis中，供未预加载模板的进程共享
+SUGGESTIONS_CACHE_PREFIX = "content:suggestions:"
+SUGGESTIONS_CACHE_TTL = 3600  # 1小时
+
+# 内容建议模板的版本号：写入内容建议后更新，各进程读取时比对，不一致则重新加载内存中的模板；
+# 设置过期时间，绕过应用直接改库的情况最迟一个TTL后也会重新加载
+SUGGESTIONS_VERSION_KEY = "content:suggestions_version"
+SUGGESTIONS_VERSION_TTL = SUGGESTIONS_CACHE_TTL
+# 两次比对版本号的最短间隔（秒）：间隔内直接使用内存中的模板，不必每次请求都读Redis
+SUGGESTIONS_VERSION_CHECK_INTERVAL = 5
+
+# 内容建议模板只有几十条且运行期间基本不变，启动时一次性加载到内存，按分类直接查表；
+# 版本号变化时重新加载，加载失败时回退到按分类查询数据库
+_suggestion_templates: Optional[Dict[str, Dict[str, List[str]]]] = None
+_suggestion_templates_version: Optional[str] = None
+_suggestion_templates_checked_at = 0.0
+
+
+# suggestion_type -> 模板分组，逐行分组时查表代替 if/elif 比较
+_BUCKET = {
+    "title": "title_templates",
+    "outline": "outline_templates",
+    "keyPoint": "key_point_templates",
+    "introduction": "intro_templates",
+}
+
+
+def _empty_suggestions() -> Dict[str, List[str]]:
+    return {
+        "title_templates": [],
+        "outline_templates": [],
+        "key_point_templates": [],
+        "intro_templates": []
+    }
+
+
+@lru_cache(maxsize=2048)
+def _split_template(template: str) -> Tuple[str, ...]:
+    # 模板在各话题间共享，按 {topic} 切分一次后缓存，代入时直接拼接
+    return tuple(template.split("{topic}"))
+
+
+def _fill_template(template: str, title: str) -> str:
+    return title.join(_split_template(template))
+
+
+# 子话题模板为固定后缀，模块加载时构建一次，调用时只拼接标题
+_DEFAULT_SUBTOPIC_SUFFIXES: Tuple[str, ...] = (
+    "的历史背景与发展",
+    "的核心技术原理",
+    "在行业中的应用场景",
+    "面临的主要挑战",
+    "未来的发展趋势",
+)
+
+_CATEGORY_SUBTOPIC_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "科技": (
+        "的技术架构解析",
+        "对传统技术的颠覆",
+        "的商业化路径",
+        "与人工智能的结合",
+        "的隐私与安全问题",
+    ),
+    "财经": (
+        "的投资价值分析",
+        "对市场格局的影响",
+        "背后的商业模式",
+        "的风险控制策略",
+        "相关企业估值研究",
+    ),
+    "教育": (
+        "在教育领域的创新应用",
+        "对学习方式的改变",
+        "的教学效果评估",
+        "与传统教育的融合",
+        "的可持续发展模式",
+    ),
+    # Add more categories as needed
+}
 
 
 class ContentService:
     """Service for content generation and related operations."""
     
+    @staticmethod
+    async def load_content_suggestions(db: AsyncSession) -> int:
+        """
+        Load all content suggestion templates into the in-process cache.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of categories loaded
+        """
+        global _suggestion_templates, _suggestion_templates_version, _suggestion_templates_checked_at
+        
+        # 先取版本号再加载：加载期间若有写入，版本号已变，下次读取时会再次加载
+        version = await ContentService.get_suggestions_version()
+        
+        stmt = select(
+            ContentSuggestion.category,
+            ContentSuggestion.suggestion_type,
+            ContentSuggestion.content,
+        ).order_by(
+            ContentSuggestion.category,
+            ContentSuggestion.suggestion_type,
+            ContentSuggestion.position,
+        )
+        result = await db.execute(stmt)
+        
+        templates: Dict[str, Dict[str, List[str]]] = {}
+        for category, suggestion_type, content in result:
+            bucket = templates.get(category)
+            if bucket is None:
+                bucket = templates[category] = _empty_suggestions()
+            key = _BUCKET.get(suggestion_type)
+            if key:
+                bucket[key].append(content)
+        
+        # 整体替换，读取方不会看到加载到一半的数据
+        _suggestion_templates = templates
+        _suggestion_templates_version = version
+        _suggestion_templates_checked_at = time.monotonic()
+        logger.info(f"📚 已加载内容建议模板: {len(templates)} 个分类")
+        return len(templates)
+    
+    @staticmethod
+    async def get_suggestions_version() -> str:
+        """Get the current version token of the suggestion templates."""
+        version = await redis_manager.get(SUGGESTIONS_VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            await redis_manager.set(SUGGESTIONS_VERSION_KEY, version, expire=SUGGESTIONS_VERSION_TTL)
+        return version
+    
+    @staticmethod
+    async def clear_content_suggestions_cache() -> None:
+        """Invalidate cached templates in every process after suggestions change."""
+        global _suggestion_templates_checked_at
+        # 本进程下次读取时立即比对版本号，其他进程最迟SUGGESTIONS_VERSION_CHECK_INTERVAL秒后比对
+        _suggestion_templates_checked_at = 0.0
+        # 写入新版本号，各进程下次读取时发现不一致并重新加载
+        await redis_manager.set(
+            SUGGESTIONS_VERSION_KEY, uuid.uuid4().hex, expire=SUGGESTIONS_VERSION_TTL
+        )
+        keys = await redis_manager.keys(f"{SUGGESTIONS_CACHE_PREFIX}*")
+        if keys:
+            await redis_manager.delete(*keys)
+    
+    @staticmethod
+    def clear_content_suggestions_cache_sync() -> None:
+        """Synchronous variant of clear_content_suggestions_cache for seed scripts."""
+        # 初始化脚本运行在同步上下文中，不经过redis_manager；删除版本号后各进程读取时生成新值并重新加载
+        try:
+            import redis
+            
+            with redis.Redis.from_url(settings.REDIS_URL) as client:
+                keys = list(client.scan_iter(match=f"{SUGGESTIONS_CACHE_PREFIX}*"))
+                client.delete(SUGGESTIONS_VERSION_KEY, *keys)
+        except Exception as e:
+            logger.warning(f"⚠️ 清除内容建议缓存失败，最迟 {SUGGESTIONS_VERSION_TTL} 秒后自动重新加载: {e}")
+    
+    @staticmethod
+    async def create_suggestion(db: AsyncSession, obj_in: ContentSuggestionCreate) -> ContentSuggestion:
+        """Create a content suggestion and invalidate the cached templates."""
+        db_obj = await content_suggestion.create(db, obj_in=obj_in)
+        await ContentService.clear_content_suggestions_cache()
+        return db_obj
+    
+    @staticmethod
+    async def create_suggestions(
+        db: AsyncSession, obj_in_list: List[ContentSuggestionCreate]
+    ) -> List[ContentSuggestion]:
+        """Create several content suggestions and invalidate the cached templates."""
+        db_objs = await content_suggestion.create_batch(db, obj_in_list=obj_in_list)
+        await ContentService.clear_content_suggestions_cache()
+        return db_objs
+    
+    @staticmethod
+    async def update_suggestion(
+        db: AsyncSession,
+        db_obj: ContentSuggestion,
+        obj_in: Union[ContentSuggestionBase, Dict[str, Any]],
+    ) -> ContentSuggestion:
+        """Update a content suggestion and invalidate the cached templates."""
+        db_obj = await content_suggestion.update(db, db_obj=db_obj, obj_in=obj_in)
+        await ContentService.clear_content_suggestions_cache()
+        return db_obj
+    
+    @staticmethod
+    async def remove_suggestion(db: AsyncSession, suggestion_id: int) -> Optional[ContentSuggestion]:
+        """Delete a content suggestion and invalidate the cached templates."""
+        obj = await content_suggestion.remove(db, id=suggestion_id)
+        if obj:
+            await ContentService.clear_content_suggestions_cache()
+        return obj
+    
     @staticmethod
     async def get_content_suggestions_by_category(db: AsyncSession, category: str) -> Dict[str, List[str]]:
         """
@@ -26,31 +226,45 @@ class ContentService:
         Returns:
             Dictionary of suggestion types and their corresponding content lists
         """
+        global _suggestion_templates_checked_at
+        now = time.monotonic()
+        if now - _suggestion_templates_checked_at >= SUGGESTIONS_VERSION_CHECK_INTERVAL:
+            _suggestion_templates_checked_at = now
+            version = await ContentService.get_suggestions_version()
+            if _suggestion_templates_version != version:
+                try:
+                    await ContentService.load_content_suggestions(db)
+                except Exception as e:
+                    # 重新加载失败时沿用已有模板（可能稍旧）；从未加载成功则按分类查询
+                    logger.warning(f"⚠️ 内容建议模板重新加载失败: {e}")
+        
+        templates = _suggestion_templates
+        if templates is not None:
+            # 返回浅拷贝，调用方替换某一类模板时不影响缓存
+            return dict(templates.get(category) or _empty_suggestions())
+        
+        cache_key = f"{SUGGESTIONS_CACHE_PREFIX}{category}"
+        cached = await redis_manager.get(cache_key)
+        if cached:
+            return cached
+        
+        # 只取用到的两列并流式读取，不构建ORM对象，也不一次性物化全部结果
         stmt = (
-            select(ContentSuggestion)
+            select(ContentSuggestion.suggestion_type, ContentSuggestion.content)
             .where(ContentSuggestion.category == category)
             .order_by(ContentSuggestion.suggestion_type, ContentSuggestion.position)
+            .execution_options(yield_per=500)
         )
-        result = await db.execute(stmt)
-        suggestions = list(result.scalars().all())
-        
-        result = {
-            "title_templates": [],
-            "outline_templates": [],
-            "key_point_templates": [],
-            "intro_templates": []
-        }
-        
-        for suggestion in suggestions:
-            if suggestion.suggestion_type == "title":
-                result["title_templates"].append(suggestion.content)
-            elif suggestion.suggestion_type == "outline":
-                result["outline_templates"].append(suggestion.content)
-            elif suggestion.suggestion_type == "keyPoint":
-                result["key_point_templates"].append(suggestion.content)
-            elif suggestion.suggestion_type == "introduction":
-                result["intro_templates"].append(suggestion.content)
+        rows = await db.stream(stmt)
         
+        result = _empty_suggestions()
+        
+        async for suggestion_type, content in rows:
+            key = _BUCKET.get(suggestion_type)
+            if key:
+                result[key].append(content)
+        
+        await redis_manager.set(cache_key, result, expire=SUGGESTIONS_CACHE_TTL)
         return result
     
     @staticmethod
@@ -65,17 +279,52 @@ class ContentService:
         Returns:
             Generated content including title suggestions, outline, key points, and introduction
         """
-        # Get the topic
-        stmt = select(Topic).where(Topic.id == topic_id)
-        result = await db.execute(stmt)
-        topic = result.scalar_one_or_none()
+        # 单个话题也走批量路径，只保留一份加载和渲染逻辑
+        contents = await ContentService.generate_content_for_topics(db, [topic_id])
         
-        if not topic:
+        if topic_id not in contents:
             raise ValueError(f"Topic with ID {topic_id} not found")
             
-        # Get suggestions for the topic's category
-        category = topic.category or "default"
-        suggestions = await ContentService.get_content_suggestions_by_category(db, category)
+        return contents[topic_id]
+    
+    @staticmethod
+    async def generate_content_for_topics(db: AsyncSession, topic_ids: List[int]) -> Dict[int, GeneratedContent]:
+        """
+        Generate content suggestions for several topics at once.
+        
+        Args:
+            db: Database session
+            topic_ids: IDs of the topics to generate content for
+            
+        Returns:
+            Generated content keyed by topic ID; unknown IDs are omitted
+        """
+        if not topic_ids:
+            return {}
+        
+        # 所有话题一次查询取回
+        result = await db.execute(select(Topic).where(Topic.id.in_(set(topic_ids))))
+        topics = {topic.id: topic for topic in result.scalars()}
+        
+        # 每个分类的模板只取一次，多个话题共享
+        suggestions_by_category: Dict[Optional[str], Dict[str, List[str]]] = {}
+        contents = {}
+        for topic_id in topic_ids:
+            topic = topics.get(topic_id)
+            if topic is None:
+                continue
+            suggestions = suggestions_by_category.get(topic.category)
+            if suggestions is None:
+                suggestions = await ContentService._get_suggestions_for_category(db, topic.category)
+                suggestions_by_category[topic.category] = suggestions
+            contents[topic_id] = ContentService._render_content(topic.title, suggestions)
+        
+        return contents
+    
+    @staticmethod
+    async def _get_suggestions_for_category(db: AsyncSession, category: Optional[str]) -> Dict[str, List[str]]:
+        """Get a category's templates, filling missing types from the default category."""
+        suggestions = await ContentService.get_content_suggestions_by_category(db, category or "default")
         
         # Use default suggestions if no category-specific ones exist
         if not suggestions["title_templates"]:
@@ -84,27 +333,32 @@ class ContentService:
                 if not suggestions[key]:
                     suggestions[key] = value
         
+        return suggestions
+    
+    @staticmethod
+    def _render_content(title: str, suggestions: Dict[str, List[str]]) -> GeneratedContent:
+        """Fill the templates with a topic title."""
         # Format the suggestions with the topic title
         title_suggestions = [
-            template.replace("{topic}", topic.title) 
+            _fill_template(template, title)
             for template in suggestions["title_templates"][:4]  # Limit to 4 suggestions
         ]
         
         outline = [
-            template.replace("{topic}", topic.title)
+            _fill_template(template, title)
             for template in suggestions["outline_templates"]
         ]
         
         key_points = [
-            template.replace("{topic}", topic.title)
+            _fill_template(template, title)
             for template in suggestions["key_point_templates"][:5]  # Limit to 5 key points
         ]
         
         # Get the first introduction template or use a default one
         introduction = (
-            suggestions["intro_templates"][0].replace("{topic}", topic.title)
+            _fill_template(suggestions["intro_templates"][0], title)
             if suggestions["intro_templates"]
-            else f"在当今快速变化的数字化时代，{topic.title}已成为业界关注的焦点。本文将深入探讨这一领域的最新发展，分析其对行业的影响，并提供实用的策略和建议，帮助读者更好地理解和应用相关知识。"
+            else f"在当今快速变化的数字化时代，{title}已成为业界关注的焦点。本文将深入探讨这一领域的最新发展，分析其对行业的影响，并提供实用的策略和建议，帮助读者更好地理解和应用相关知识。"
         )
         
         return GeneratedContent(
@@ -127,43 +381,8 @@ class ContentService:
             List of generated subtopics
         """
         # This is a simplified version - in production, this might use ML models or APIs
-        default_subtopics = [
-            f"{topic_title}的历史背景与发展",
-            f"{topic_title}的核心技术原理",
-            f"{topic_title}在行业中的应用场景",
-            f"{topic_title}面临的主要挑战",
-            f"{topic_title}未来的发展趋势"
-        ]
-        
-        category_subtopics = {
-            "科技": [
-                f"{topic_title}的技术架构解析",
-                f"{topic_title}对传统技术的颠覆",
-                f"{topic_title}的商业化路径",
-                f"{topic_title}与人工智能的结合",
-                f"{topic_title}的隐私与安全问题"
-            ],
-            "财经": [
-                f"{topic_title}的投资价值分析",
-                f"{topic_title}对市场格局的影响",
-                f"{topic_title}背后的商业模式",
-                f"{topic_title}的风险控制策略",
-                f"{topic_title}相关企业估值研究"
-            ],
-            "教育": [
-                f"{topic_title}在教育领域的创新应用",
-                f"{topic_title}对学习方式的改变",
-                f"{topic_title}的教学效果评估",
-                f"{topic_title}与传统教育的融合",
-                f"{topic_title}的可持续发展模式"
-            ],
-            # Add more categories as needed
-        }
-        
-        if category and category in category_subtopics:
-            return category_subtopics[category]
-        
-        return default_subtopics
+        suffixes = _CATEGORY_SUBTOPIC_SUFFIXES.get(category, _DEFAULT_SUBTOPIC_SUFFIXES)
+        return [topic_title + suffix for suffix in suffixes]
 
 # Create a singleton instance of the ContentService
 content_service = ContentService() 
\ No newline at end of file
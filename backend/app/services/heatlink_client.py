@@ -1,4 +1,10 @@
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import unquote
 
 import httpx
@@ -6,7 +12,7 @@ from fastapi import HTTPException
 from loguru import logger
 from tenacity import (
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
 )
@@ -14,6 +20,176 @@ from tenacity import (
 from app.core.config import settings
 from app.db.redis import redis_manager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx的HTTP/2支持依赖h2（httpx[http2]），未安装时使用HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# 响应体用orjson解析（比标准库json快数倍），不可用时回退到json
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+# 进程内LRU缓存：热点键直接命中本地，省去Redis往返；条目数和存活时间都很小，
+# 其他进程清除缓存后本地副本最多再保留 LOCAL_CACHE_TTL 秒
+LOCAL_CACHE_SIZE = 256
+LOCAL_CACHE_TTL = 30
+
+# 网关类错误通常是暂时的，GET请求遇到这些状态码或超时时重试；其余4xx/5xx直接抛出
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+# 连接建立失败时由httpx传输层重试的次数
+CONNECT_RETRIES = 3
+
+
+# X-RateLimit-Remaining低于该值时，把剩余额度平摊到本窗口剩余时间内
+RATE_LIMIT_LOW_REMAINING = 5
+# Retry-After最多按请求超时的这个倍数处理，避免一个异常的大值让所有请求长时间停摆
+RETRY_AFTER_MAX_FACTOR = 3
+
+
+class _TokenBucket:
+    """Async token bucket limiting outgoing requests to ``rate`` per second.
+    
+    Each caller reserves a token and sleeps until it is due, without holding a
+    lock; a caller that would have to wait longer than ``max_wait`` fails fast
+    with 503 instead. The rate can be narrowed for a while from the upstream
+    rate-limit headers and falls back to the configured rate once that window
+    has passed. Retry-After pauses the bucket for at most ``max_retry_after``.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_wait: float, max_retry_after: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self.max_retry_after = max_retry_after
+        self._tokens = float(capacity)
+        # _tokens对应的时间点；Retry-After期间位于未来，在此之前不补充令牌
+        self._updated = time.monotonic()
+        self._restore_at = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self._restore_at and now >= self._restore_at:
+            self.rate = self.base_rate
+            self._restore_at = 0.0
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        # 预订一个令牌；不足时令牌数为负，表示前面已排队的预订
+        self._tokens -= 1
+        wait = (self._updated - now) + max(-self._tokens, 0.0) / self.rate
+        if wait > self.max_wait:
+            # 等待超过请求超时时间则直接失败并归还预订，由调用方走过期缓存等兜底逻辑
+            self._tokens += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"HeatLink API rate limited, next request slot in {wait:.0f}s"
+            )
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, headers: httpx.Headers) -> None:
+        """Tune the bucket from Retry-After / X-RateLimit-* response headers."""
+        now = time.monotonic()
+        
+        retry_after = _header_seconds(headers.get("Retry-After"))
+        if retry_after is not None:
+            # 上游要求等待：在此之前不再补充令牌
+            retry_after = min(retry_after, self.max_retry_after)
+            self._refill(now)
+            self._updated = max(self._updated, now + retry_after)
+            self._tokens = min(self._tokens, 0.0)
+            logger.warning(f"HeatLink要求等待 {retry_after:g}s 后再请求")
+            return
+        
+        remaining = _header_seconds(headers.get("X-RateLimit-Remaining"))
+        reset = _header_seconds(headers.get("X-RateLimit-Reset"))
+        if remaining is None or reset is None or remaining >= RATE_LIMIT_LOW_REMAINING:
+            return
+        # X-RateLimit-Reset可能是秒数，也可能是Unix时间戳
+        if reset > 1e9:
+            reset -= time.time()
+        reset = max(reset, 1.0)
+        self._refill(now)
+        self.rate = min(self.base_rate, max(remaining, 1.0) / reset)
+        self._tokens = min(self._tokens, remaining)
+        self._restore_at = now + reset
+        logger.debug(f"HeatLink剩余额度 {remaining:.0f}，限速至 {self.rate:.2f} 次/秒，持续 {reset:.0f}s")
+
+
+def _header_seconds(value: Optional[str]) -> Optional[float]:
+    """Numeric header value, or None when absent or not a number (e.g. an HTTP date)."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.TimeoutException):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in RETRY_STATUS_CODES
+
+
+def _with_optional(params: Dict[str, Any], **optional: Any) -> Dict[str, Any]:
+    """Add the optional query parameters that were given (truthy) to params."""
+    params.update({key: value for key, value in optional.items() if value})
+    return params
+
+
+def _params_digest(params: Dict[str, Any]) -> str:
+    """128-bit BLAKE2b digest of the query parameters in canonical (key-sorted) form."""
+    if orjson is not None:
+        canonical = orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+# HeatLink连接池：所有请求复用同一个客户端，保持长连接，避免每次请求重新建立TCP/TLS连接
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30,
+)
+
+# 过期副本的保留时间为正常缓存时间的倍数；HeatLink返回5xx或请求失败时返回该副本
+STALE_TTL_FACTOR = 6
+
+# 没有获取到任何分类时使用的默认分类（只读，使用处按需复制）
+DEFAULT_CATEGORIES = MappingProxyType({
+    "科技": 0,
+    "财经": 0,
+    "教育": 0,
+    "汽车": 0,
+    "未分类": 0,
+})
+
+# 不同格式的来源数据中可能作为来源ID的字段，按优先级排列
+_ID_FIELDS = ("id", "source_id", "name", "key")
+_MISSING = object()
+
+# get_sources_stats并发获取来源详情的最大请求数
+SOURCE_STATS_CONCURRENCY = 32
+
 
 class HeatLinkAPIClient:
     """Client for interacting with HeatLink API."""
@@ -25,10 +201,19 @@ class HeatLinkAPIClient:
     ):
         self.base_url = base_url
         self.timeout = timeout
-        self.client_params = {
-            "timeout": timeout,
-            "headers": {"Accept": "application/json"},
-        }
+        # 长期复用的客户端，启用follow_redirects以自动处理重定向；应用关闭时调用aclose()释放连接
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"Accept": "application/json"},
+            follow_redirects=True,
+            # 自定义transport时连接池参数和http2需设置在transport上；
+            # HTTP/2下get_sources_stats的并发请求复用同一连接，服务端不支持h2时经ALPN协商回退到HTTP/1.1
+            transport=httpx.AsyncHTTPTransport(
+                limits=HTTP_LIMITS,
+                retries=CONNECT_RETRIES,
+                http2=HTTP2_ENABLED,
+            ),
+        )
         
         # 缓存配置
         self.cache_config = {
@@ -41,6 +226,32 @@ class HeatLinkAPIClient:
             "source_types": 3600,    # 来源类型缓存1小时
             "sources_stats": 1800,   # 来源统计缓存30分钟
         }
+        
+        # 固定端点 -> (缓存键前缀, 默认TTL)，构建一次，get()中一次字典查找即可
+        self._route_table: Dict[str, Tuple[str, int]] = {
+            "external/hot": ("hot_news", self.cache_config["hot_news"]),
+            "external/sources": ("sources", self.cache_config["sources"]),
+            "external/source-types": ("source_types", self.cache_config["source_types"]),
+            "external/unified": ("unified_news", self.cache_config["unified_news"]),
+            "external/search": ("search", self.cache_config["search"]),
+            "external/stats": ("sources_stats", self.cache_config["sources_stats"]),
+        }
+        
+        # 正在进行中的请求（缓存键 -> 任务），用于合并并发的相同请求
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # 本地LRU：缓存键 -> (过期时间, JSON原文)；存原文、每次命中重新解码，调用方修改返回值不会影响缓存
+        self._local_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        
+        # 主动限速：按配置速率发送请求，并根据HeatLink返回的限流响应头动态收紧；速率<=0时不限速
+        self._limiter: Optional[_TokenBucket] = None
+        if settings.HEATLINK_RATE_LIMIT > 0:
+            self._limiter = _TokenBucket(
+                settings.HEATLINK_RATE_LIMIT,
+                max(settings.HEATLINK_RATE_BURST, 1),
+                max_wait=timeout,
+                max_retry_after=timeout * RETRY_AFTER_MAX_FACTOR,
+            )
 
     async def _make_request(
         self,
@@ -60,6 +271,17 @@ class HeatLinkAPIClient:
         Returns:
             API response data
         """
+        _, response_data = await self._request(method, endpoint, params=params, data=data)
+        return response_data
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[bytes, Any]:
+        """Make a request and return both the raw JSON body and its decoded value."""
         # 构建URL，处理可能的'/api/api/'重复问题
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
@@ -72,34 +294,17 @@ class HeatLinkAPIClient:
         logger.debug(f"Making {method} request to {url}")
         
         try:
-            # 创建client时启用follow_redirects以自动处理重定向
-            client_params = {**self.client_params, "follow_redirects": True}
-            async with httpx.AsyncClient(**client_params) as client:
-                # 针对不同的HTTP方法使用不同的参数
-                if method.upper() == "GET":
-                    response = await client.get(url, params=params)
-                else:
-                    # POST, PUT等方法可以使用json参数
-                    response = await getattr(client, method.lower())(
-                        url,
-                        params=params,
-                        json=data,
-                    )
-                
-                # 检查是否发生重定向，记录日志
-                if response.history:
-                    original_url = unquote(str(response.history[0].url))
-                    final_url = unquote(str(response.url))
-                    logger.info(
-                        f"Request was redirected: {response.history[0].status_code}: "
-                        f"{original_url} -> {final_url}"
-                    )
-                
-                # Raise exception for 4xx/5xx responses
-                response.raise_for_status()
-                
-                # Return JSON response
-                return response.json()
+            if method.upper() == "GET":
+                response = await self._send_with_retry("GET", url, params=params)
+            else:
+                # POST等非幂等请求不重试，避免重复提交
+                response = await self._send(method.upper(), url, params=params, data=data)
+            
+            # Return raw body (for caching as-is) and the decoded JSON
+            return response.content, _json_loads(response.content)
+        except HTTPException:
+            # 限流等待超时等已转换好的错误直接抛出
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred: {e}")
             # Try to get error message from response
@@ -126,11 +331,65 @@ class HeatLinkAPIClient:
                 detail=f"Unexpected error: {str(e)}"
             )
 
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Send one request and raise for 4xx/5xx responses."""
+        if self._limiter is not None:
+            await self._limiter.acquire()
+        
+        # 针对不同的HTTP方法使用不同的参数
+        if method == "GET":
+            response = await self._client.get(url, params=params)
+        else:
+            # POST, PUT等方法可以使用json参数
+            response = await self._client.request(
+                method,
+                url,
+                params=params,
+                json=data,
+            )
+        
+        if self._limiter is not None:
+            self._limiter.observe(response.headers)
+        
+        # 检查是否发生重定向，记录日志
+        if response.history:
+            original_url = unquote(str(response.history[0].url))
+            final_url = unquote(str(response.url))
+            logger.info(
+                f"Request was redirected: {response.history[0].status_code}: "
+                f"{original_url} -> {final_url}"
+            )
+        
+        # Raise exception for 4xx/5xx responses
+        response.raise_for_status()
+        return response
+
     @retry(
-        retry=retry_if_exception_type(HTTPException),
+        retry=retry_if_exception(_is_transient_error),
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
+        reraise=True,
     )
+    async def _send_with_retry(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """_send, retried on timeouts and 502/503/504; only the HTTP call is repeated, not the cache layer."""
+        return await self._send(method, url, params=params, data=data)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its pooled connections."""
+        await self._client.aclose()
+
     async def get(
         self, 
         endpoint: str, 
@@ -146,45 +405,118 @@ class HeatLinkAPIClient:
             endpoint: API endpoint path
             params: Query parameters
             use_cache: Whether to use Redis cache
-            cache_key_prefix: Prefix for the cache key (defaults to endpoint)
-            cache_ttl: Cache time-to-live in seconds (overrides default)
+            cache_key_prefix: Prefix for the cache key (defaults to the route table entry)
+            cache_ttl: Cache time-to-live in seconds (overrides the route default)
             force_refresh: Force refresh from API ignoring cache
             
         Returns:
             API response data (from cache or fresh)
         """
-        # 构建缓存键
+        # 按路由表取缓存键前缀和默认TTL；未登记的端点（如带ID的路径）由调用方显式传入
+        route_prefix, route_ttl = self._route_table.get(endpoint) or (endpoint.replace("/", ":"), 300)
         if cache_key_prefix is None:
-            cache_key_prefix = endpoint.replace("/", ":")
+            cache_key_prefix = route_prefix
+        ttl = route_ttl if cache_ttl is None else cache_ttl
         
-        # 根据参数生成唯一缓存键
-        param_str = ":".join([f"{k}={v}" for k, v in (params or {}).items()]) if params else ""
-        cache_key = f"heatlink:{cache_key_prefix}:{param_str}".rstrip(":")
+        # 根据参数生成唯一缓存键：参数排序后哈希，与参数顺序无关且长度固定
+        if params:
+            cache_key = f"heatlink:{cache_key_prefix}:{_params_digest(params)}"
+        else:
+            cache_key = f"heatlink:{cache_key_prefix}"
         
-        # 如果启用缓存且不是强制刷新，先尝试从缓存获取
+        # 如果启用缓存且不是强制刷新，先尝试从本地缓存、再从Redis获取
         if use_cache and not force_refresh:
+            raw_data = self._local_get(cache_key)
+            if raw_data is not None:
+                return _json_loads(raw_data)
+            
             cached_data = await redis_manager.get(cache_key)
             if cached_data:
                 logger.debug(f"Cache hit for {cache_key}")
+                self._local_set(cache_key, _json_dumps(cached_data), ttl)
                 return cached_data
             logger.debug(f"Cache miss for {cache_key}")
         
+        if not use_cache:
+            _, response_data = await self._request("GET", endpoint, params=params)
+            return response_data
+        
+        # 同一缓存键的并发未命中只向HeatLink发一次请求，其余调用等待同一结果
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_and_cache(endpoint, params, cache_key, ttl)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        
+        # shield：某个调用方被取消时，不影响共用该请求的其他调用方
+        raw_data = await asyncio.shield(task)
+        # 每个调用方各自解码一份，调用方原地修改结果（如get_weighted_sources排序）时互不影响
+        return _json_loads(raw_data)
+
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(cache_key, None)
+        # 等待方全部被取消时没有人读取任务的异常，在这里取出，避免"Task exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_and_cache(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        cache_key: str,
+        ttl: int,
+    ) -> bytes:
+        """Fetch from the API, cache the response body under cache_key and return it.
+        
+        If HeatLink fails with a server-side error, the stale copy of the
+        last response is returned instead when one is still available.
+        """
+        stale_key = f"{cache_key}:stale"
+        
         # 从API获取数据
-        response_data = await self._make_request("GET", endpoint, params=params)
-        
-        # 如果启用缓存，则缓存结果
-        if use_cache and response_data:
-            # 确定缓存的TTL
-            ttl = cache_ttl
-            if ttl is None:
-                # 根据请求类型确定默认TTL
-                endpoint_type = endpoint.split("/")[0] if "/" in endpoint else endpoint
-                ttl = self.cache_config.get(endpoint_type, 300)  # 默认5分钟
+        try:
+            raw_data, response_data = await self._request("GET", endpoint, params=params)
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise
+            stale_data = await redis_manager.get(stale_key)
+            if not stale_data:
+                raise
+            logger.warning(f"HeatLink请求失败，返回过期缓存 {cache_key}: {e.detail}")
+            return _json_dumps(stale_data)
+        
+        # 缓存结果
+        if response_data:
+            self._local_set(cache_key, raw_data, ttl)
             
             logger.debug(f"Caching data with key {cache_key}, TTL: {ttl}s")
-            await redis_manager.set(cache_key, response_data, expire=ttl)
+            # 直接缓存HeatLink返回的JSON原文，省去重新编码；命中时由redis_manager按JSON解码
+            # 另存一份保留更久的副本，HeatLink出错时用作兜底
+            await asyncio.gather(
+                redis_manager.set_raw(cache_key, raw_data, expire=ttl),
+                redis_manager.set_raw(stale_key, raw_data, expire=ttl * STALE_TTL_FACTOR),
+            )
         
-        return response_data
+        return raw_data
+
+    def _local_get(self, cache_key: str) -> Optional[bytes]:
+        entry = self._local_cache.get(cache_key)
+        if entry is None:
+            return None
+        expire_at, raw_data = entry
+        if expire_at <= time.monotonic():
+            del self._local_cache[cache_key]
+            return None
+        self._local_cache.move_to_end(cache_key)
+        return raw_data
+
+    def _local_set(self, cache_key: str, raw_data: bytes, ttl: int) -> None:
+        self._local_cache[cache_key] = (time.monotonic() + min(ttl, LOCAL_CACHE_TTL), raw_data)
+        self._local_cache.move_to_end(cache_key)
+        if len(self._local_cache) > LOCAL_CACHE_SIZE:
+            self._local_cache.popitem(last=False)
 
     async def post(
         self, endpoint: str, data: Dict[str, Any], params: Optional[Dict[str, Any]] = None
@@ -203,21 +535,20 @@ class HeatLinkAPIClient:
         use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Get hot news from HeatLink API."""
-        params = {
-            "hot_limit": hot_limit,
-            "recommended_limit": recommended_limit,
-            "category_limit": category_limit,
-        }
-        if timeout:
-            params["timeout"] = timeout
-            
+        params = _with_optional(
+            {
+                "hot_limit": hot_limit,
+                "recommended_limit": recommended_limit,
+                "category_limit": category_limit,
+            },
+            timeout=timeout,
+        )
+        
         return await self.get(
             "external/hot", 
             params=params,
             use_cache=use_cache,
-            cache_key_prefix="hot_news",
             force_refresh=force_update,
-            cache_ttl=self.cache_config["hot_news"]
         )
     
     # Source endpoints
@@ -266,10 +597,8 @@ class HeatLinkAPIClient:
         force_update: bool = False,
     ) -> Dict[str, Any]:
         """Get details and news for a specific source from HeatLink API."""
-        params = {}
-        if timeout:
-            params["timeout"] = timeout
-            
+        params = _with_optional({}, timeout=timeout)
+        
         return await self.get(
             f"external/source/{source_id}", 
             params=params,
@@ -284,9 +613,7 @@ class HeatLinkAPIClient:
         return await self.get(
             "external/source-types",
             use_cache=use_cache,
-            cache_key_prefix="source_types",
             force_refresh=force_update,
-            cache_ttl=self.cache_config["source_types"]
         )
     
     # News endpoints
@@ -307,36 +634,28 @@ class HeatLinkAPIClient:
         force_update: bool = False,
     ) -> Dict[str, Any]:
         """Get unified news from HeatLink API."""
-        params = {
-            "page": page,
-            "page_size": page_size,
-            "sort_by": sort_by,
-            "sort_order": sort_order,
-        }
-        
         # Add optional params if provided
-        if category:
-            params["category"] = category
-        if country:
-            params["country"] = country
-        if language:
-            params["language"] = language
-        if source_id:
-            params["source_id"] = source_id
-        if keyword:
-            params["keyword"] = keyword
-        if timeout:
-            params["timeout"] = timeout
-        if max_concurrent:
-            params["max_concurrent"] = max_concurrent
-            
+        params = _with_optional(
+            {
+                "page": page,
+                "page_size": page_size,
+                "sort_by": sort_by,
+                "sort_order": sort_order,
+            },
+            category=category,
+            country=country,
+            language=language,
+            source_id=source_id,
+            keyword=keyword,
+            timeout=timeout,
+            max_concurrent=max_concurrent,
+        )
+        
         return await self.get(
             "external/unified", 
             params=params,
             use_cache=use_cache,
-            cache_key_prefix="unified_news",
             force_refresh=force_update,
-            cache_ttl=self.cache_config["unified_news"]
         )
     
     # Search endpoints
@@ -354,32 +673,26 @@ class HeatLinkAPIClient:
         force_update: bool = False,
     ) -> Dict[str, Any]:
         """Search news from HeatLink API."""
-        params = {
-            "query": query,
-            "page": page,
-            "page_size": page_size,
-        }
-        
         # Add optional params if provided
-        if category:
-            params["category"] = category
-        if country:
-            params["country"] = country
-        if language:
-            params["language"] = language
-        if source_id:
-            params["source_id"] = source_id
-        if max_results:
-            params["max_results"] = max_results
-            
+        params = _with_optional(
+            {
+                "query": query,
+                "page": page,
+                "page_size": page_size,
+            },
+            category=category,
+            country=country,
+            language=language,
+            source_id=source_id,
+            max_results=max_results,
+        )
+        
         # 搜索结果使用较短的缓存时间
         return await self.get(
             "external/search", 
             params=params,
             use_cache=use_cache,
-            cache_key_prefix="search",
             force_refresh=force_update,
-            cache_ttl=self.cache_config["search"]
         )
 
     async def get_sources_stats(self, use_cache: bool = True, force_update: bool = False) -> Dict[str, Any]:
@@ -399,7 +712,6 @@ class HeatLinkAPIClient:
             
             # Initialize categories counter
             categories_count = {}
-            source_count = 0
             news_count = 0
             
             # Adapt to different API response formats
@@ -419,31 +731,48 @@ class HeatLinkAPIClient:
             # Log source count
             logger.debug(f"Processing {len(sources_list)} sources for stats")
             
-            # For each source, get its stats
+            # Collect source ids - try different possible id field names
+            source_ids = []
             for source in sources_list:
-                # Try different possible id field names
-                source_id = None
-                for id_field in ["id", "source_id", "name", "key"]:
-                    if id_field in source:
-                        source_id = source.get(id_field)
-                        break
+                # 取第一个存在的ID字段
+                source_id = next(
+                    (value for field in _ID_FIELDS if (value := source.get(field, _MISSING)) is not _MISSING),
+                    None,
+                )
                         
                 if not source_id:
                     logger.warning(f"Skipping source without id: {source}")
                     continue
                 
-                source_count += 1
-                
-                try:
+                source_ids.append(source_id)
+            
+            source_count = len(source_ids)
+            
+            # 并发获取各来源的详情，用信号量限制同时发出的请求数
+            semaphore = asyncio.Semaphore(SOURCE_STATS_CONCURRENCY)
+            
+            async def fetch_source_stats(source_id: str) -> Any:
+                async with semaphore:
                     # Get stats for this source - using the correct API path
-                    source_stats = await self.get(
+                    return await self.get(
                         f"external/source/{source_id}",
                         use_cache=use_cache,
                         cache_key_prefix=f"source:{source_id}:stats",
                         force_refresh=force_update,
                         cache_ttl=self.cache_config["source_detail"]
                     )
-                    
+            
+            results = await asyncio.gather(
+                *(fetch_source_stats(source_id) for source_id in source_ids),
+                return_exceptions=True,
+            )
+            
+            for source_id, source_stats in zip(source_ids, results):
+                if isinstance(source_stats, BaseException):
+                    logger.warning(f"Failed to get stats for source {source_id}: {source_stats}")
+                    continue
+                
+                try:
                     # Aggregate categories - handle different return structures
                     source_categories = {}
                     
@@ -480,13 +809,7 @@ class HeatLinkAPIClient:
             
             # Ensure we have at least some default categories if none found
             if not categories_count:
-                categories_count = {
-                    "科技": 0,
-                    "财经": 0,
-                    "教育": 0,
-                    "汽车": 0,
-                    "未分类": 0
-                }
+                categories_count = dict(DEFAULT_CATEGORIES)
             
             # Create aggregated stats result
             result = {
@@ -505,13 +828,7 @@ class HeatLinkAPIClient:
             logger.error(f"Error aggregating sources stats: {e}")
             # Return default categories on error
             return {
-                "categories": {
-                    "科技": 0,
-                    "财经": 0,
-                    "教育": 0,
-                    "汽车": 0,
-                    "未分类": 0
-                }, 
+                "categories": dict(DEFAULT_CATEGORIES), 
                 "sources_count": 0, 
                 "news_count": 0
             }
@@ -520,18 +837,10 @@ class HeatLinkAPIClient:
     async def clear_all_caches(self) -> bool:
         """Clear all HeatLink API caches."""
         try:
-            pattern = "heatlink:*"
-            if redis_manager.redis_client:
-                keys = await redis_manager.redis_client.keys(pattern)
-                if keys:
-                    # 使用await处理异步调用
-                    if len(keys) > 1:
-                        await redis_manager.redis_client.delete(*keys)
-                    elif keys:
-                        await redis_manager.redis_client.delete(keys[0])
-                logger.info(f"Cleared all HeatLink API caches: {len(keys)} keys")
-                return True
-            return False
+            self._local_cache.clear()
+            deleted = await redis_manager.delete_pattern("heatlink:*")
+            logger.info(f"Cleared all HeatLink API caches: {deleted} keys")
+            return True
         except Exception as e:
             logger.error(f"Error clearing caches: {e}")
             return False
@@ -539,18 +848,12 @@ class HeatLinkAPIClient:
     async def clear_cache_by_prefix(self, prefix: str) -> bool:
         """Clear caches by prefix (e.g., 'hot_news', 'sources')."""
         try:
-            pattern = f"heatlink:{prefix}:*"
-            if redis_manager.redis_client:
-                keys = await redis_manager.redis_client.keys(pattern)
-                if keys:
-                    # 使用await处理异步调用
-                    if len(keys) > 1:
-                        await redis_manager.redis_client.delete(*keys)
-                    elif keys:
-                        await redis_manager.redis_client.delete(keys[0])
-                logger.info(f"Cleared {prefix} caches: {len(keys)} keys")
-                return True
-            return False
+            local_prefix = f"heatlink:{prefix}:"
+            for key in [key for key in self._local_cache if key.startswith(local_prefix)]:
+                del self._local_cache[key]
+            deleted = await redis_manager.delete_pattern(f"{local_prefix}*")
+            logger.info(f"Cleared {prefix} caches: {deleted} keys")
+            return True
         except Exception as e:
             logger.error(f"Error clearing {prefix} caches: {e}")
             return False
@@ -16,7 +16,7 @@ from app.db.redis import redis_manager
 from app.models.news_heat_score import NewsHeatScore
 from app.schemas.news_heat_score import HeatScoreCreate, HeatScoreUpdate
 from app.crud import news_heat_score
-from app.services.heatlink_client import HeatLinkAPIClient
+from app.services.heatlink_client import heatlink_client
 
 # 设置NLTK数据目录
 NLTK_DATA_DIR = Path(__file__).parent.parent.parent / "nltk_data"
@@ -67,7 +67,8 @@ class NewsHeatScoreService:
     """Service for calculating and managing news heat scores."""
 
     def __init__(self):
-        self.heatlink_client = HeatLinkAPIClient()
+        # 与API共用同一个HeatLink客户端及其连接池
+        self.heatlink_client = heatlink_client
         
         # 加载停用词
         self._load_stopwords()
@@ -369,6 +370,18 @@ class NewsHeatScoreService:
         session: AsyncSession
     ) -> NewsHeatScore:
         """为单个新闻项计算热度分数"""
+        heat_score = await self._build_heat_score(news_item, all_news_items, session)
+        
+        # 保存到数据库
+        return await news_heat_score.create(session, heat_score)
+
+    async def _build_heat_score(
+        self, 
+        news_item: Dict[str, Any], 
+        all_news_items: List[Dict[str, Any]],
+        session: AsyncSession
+    ) -> HeatScoreCreate:
+        """计算单个新闻项的热度分数，返回待保存的评分数据"""
         try:
             # 提取关键词
             keywords = await self._extract_keywords(
@@ -492,10 +505,7 @@ class NewsHeatScoreService:
                 published_at=published_time,
             )
             
-            # 保存到数据库
-            db_obj = await news_heat_score.create(session, heat_score)
-            
-            return db_obj
+            return heat_score
             
         except Exception as e:
             import traceback
@@ -523,14 +533,14 @@ class NewsHeatScoreService:
         """批量计算热度分数"""
         logger.info(f"开始计算{len(news_items)}条新闻的热度分数")
         
-        results = {}
+        heat_scores = []
         for news_item in news_items:
             try:
-                score_obj = await self.calculate_heat_score(
+                heat_score = await self._build_heat_score(
                     news_item, news_items, session
                 )
-                results[news_item["id"]] = score_obj
-                logger.debug(f"新闻[{news_item['id']}]热度计算完成: {score_obj.heat_score}")
+                heat_scores.append(heat_score)
+                logger.debug(f"新闻[{news_item['id']}]热度计算完成: {heat_score.heat_score}")
             except Exception as e:
                 import traceback
                 error_location = traceback.extract_tb(e.__traceback__)[-1]
@@ -549,6 +559,10 @@ class NewsHeatScoreService:
                 )
                 logger.error(error_msg)
         
+        # 所有评分用一条INSERT批量保存
+        db_objs = await news_heat_score.bulk_create(session, heat_scores)
+        results = {db_obj.news_id: db_obj for db_obj in db_objs}
+        
         logger.info(f"批量热度计算完成，成功: {len(results)}, 总数: {len(news_items)}")
         return results
 
@@ -568,15 +582,10 @@ class NewsHeatScoreService:
         
         # 从数据库获取
         logger.debug(f"从数据库获取热度分数，请求 {ids_count} 条记录")
-        scores_map = await news_heat_score.get_multi_by_news_ids(session, news_ids)
+        scores_map = await news_heat_score.get_latest_scores_by_news_ids(session, news_ids)
         
-        # 转换为所需格式
-        result = {}
-        for news_id in news_ids:
-            if news_id in scores_map:
-                result[news_id] = scores_map[news_id].heat_score
-            else:
-                result[news_id] = 0  # 默认分数
+        # 转换为所需格式，没有记录的新闻使用默认分数0
+        result = {news_id: scores_map.get(news_id, 0) for news_id in news_ids}
         
         # 缓存结果
         await redis_manager.set(cache_key, result, expire=CACHE_TTL)
@@ -599,13 +608,10 @@ class NewsHeatScoreService:
         
         # 从数据库获取
         logger.debug(f"从数据库获取详细热度数据，请求 {ids_count} 条记录")
-        scores_map = await news_heat_score.get_multi_by_news_ids(session, news_ids)
+        docs_map = await news_heat_score.get_latest_docs_by_news_ids(session, news_ids)
         
-        # 转换为所需格式
-        result = {}
-        for news_id in news_ids:
-            if news_id in scores_map:
-                result[news_id] = scores_map[news_id].to_dict()
+        # 按请求顺序输出，每条已是数据库生成的字典
+        result = {news_id: docs_map[news_id] for news_id in news_ids if news_id in docs_map}
         
         # 缓存结果
         await redis_manager.set(cache_key, result, expire=CACHE_TTL)
@@ -621,14 +627,26 @@ class NewsHeatScoreService:
         max_age_hours: Optional[int] = 72,
         category: Optional[str] = None,
         session: AsyncSession = None,
+        cursor_heat: Optional[float] = None,
+        cursor_id: Optional[uuid.UUID] = None,
     ) -> List[Dict[str, Any]]:
-        """获取热门新闻列表"""
+        """获取热门新闻列表
+        
+        传入上一页最后一条的 heat_score 和 id 作为 cursor_heat/cursor_id 获取下一页
+        """
         try:
-            logger.info(f"获取热门新闻列表: limit={limit}, skip={skip}, min_score={min_score}, max_age_hours={max_age_hours}, category={category}")
+            logger.info(f"获取热门新闻列表: limit={limit}, skip={skip}, min_score={min_score}, max_age_hours={max_age_hours}, category={category}, cursor=({cursor_heat}, {cursor_id})")
             
             # 使用新的字典返回方法，避免 ORM 模型和相关异步问题
             news_list = await news_heat_score.get_top_news_as_dict(
-                session, limit, skip, min_score, max_age_hours, category
+                session,
+                limit=limit,
+                skip=skip,
+                min_score=min_score,
+                max_age_hours=max_age_hours,
+                category=category,
+                cursor_heat=cursor_heat,
+                cursor_id=cursor_id,
             )
             
             logger.info(f"成功获取热门新闻列表，共 {len(news_list)} 条记录")
@@ -776,7 +794,9 @@ class NewsHeatScoreService:
                 limit=1000,  # 增加获取的新闻数量到1000条
                 skip=0,
                 min_score=20,  # 降低热度分数阈值到20
-                max_age_hours=12  # 只获取最近12小时的新闻
+                max_age_hours=12,  # 只获取最近12小时的新闻
+                # 只加载下面用到的列
+                load_columns=(NewsHeatScore.keywords, NewsHeatScore.heat_score, NewsHeatScore.source_id),
             )
             
             # 提取所有关键词并计算频率
@@ -0,0 +1,9 @@
+-- 为已有的 news_heat_scores 表增加冗余的 category 列
+ALTER TABLE news_heat_scores ADD COLUMN IF NOT EXISTS category VARCHAR(64);
+
+-- 从 meta_data 回填分类
+UPDATE news_heat_scores SET category = meta_data->>'category' WHERE category IS NULL AND meta_data ? 'category';
+
+-- 替换原来基于 meta_data->>'category' 的表达式索引
+DROP INDEX IF EXISTS idx_news_heat_scores_category_heat;
+CREATE INDEX IF NOT EXISTS idx_news_heat_scores_category_heat ON news_heat_scores (category, heat_score DESC, published_at);
@@ -1,6 +1,9 @@
+-- gen_random_uuid() 在 PostgreSQL 13 之前由 pgcrypto 提供
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
 -- Create news_heat_scores table
 CREATE TABLE IF NOT EXISTS news_heat_scores (
-    id VARCHAR PRIMARY KEY,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     news_id VARCHAR NOT NULL,
     source_id VARCHAR NOT NULL,
     title VARCHAR NOT NULL,
@@ -11,16 +14,30 @@ CREATE TABLE IF NOT EXISTS news_heat_scores (
     popularity_score FLOAT,
     meta_data JSONB,
     keywords JSONB,
-    calculated_at TIMESTAMP DEFAULT NOW(),
+    category VARCHAR(64),
+    calculated_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc'),
     published_at TIMESTAMP NOT NULL,
-    updated_at TIMESTAMP DEFAULT NOW()
+    updated_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc')
 );
 
 -- Create indexes
-CREATE INDEX IF NOT EXISTS idx_news_heat_scores_news_id ON news_heat_scores (news_id);
-CREATE INDEX IF NOT EXISTS idx_news_heat_scores_source_id ON news_heat_scores (source_id);
-CREATE INDEX IF NOT EXISTS idx_news_heat_scores_heat_score ON news_heat_scores (heat_score);
+CREATE INDEX IF NOT EXISTS idx_news_heat_scores_news_id_calculated_at ON news_heat_scores (news_id, calculated_at DESC);
 CREATE INDEX IF NOT EXISTS idx_news_heat_scores_published_at ON news_heat_scores (published_at);
+CREATE INDEX IF NOT EXISTS idx_news_heat_scores_heat_score_id ON news_heat_scores (heat_score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_news_heat_scores_category_heat ON news_heat_scores (category, heat_score DESC, published_at);
 
 -- Add comment
-COMMENT ON TABLE news_heat_scores IS 'Stores news heat scores calculated by the NewsHeatScore system'; 
\ No newline at end of file
+COMMENT ON TABLE news_heat_scores IS 'Stores news heat scores calculated by the NewsHeatScore system'; 
+
+-- 更新时由数据库刷新 updated_at
+CREATE OR REPLACE FUNCTION set_news_heat_scores_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := (now() AT TIME ZONE 'utc');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_heat_scores_updated_at ON news_heat_scores;
+CREATE TRIGGER trg_news_heat_scores_updated_at
+    BEFORE UPDATE ON news_heat_scores
+    FOR EACH ROW EXECUTE FUNCTION set_news_heat_scores_updated_at();
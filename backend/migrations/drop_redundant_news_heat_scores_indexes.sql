@@ -0,0 +1,7 @@
+-- 删除 news_heat_scores 上被复合索引覆盖或无查询使用的单列索引，减少每次批量写入的索引维护开销
+-- news_id：是 idx_news_heat_scores_news_id_calculated_at 的前缀
+DROP INDEX IF EXISTS idx_news_heat_scores_news_id;
+-- heat_score：idx_news_heat_scores_heat_score_id (heat_score DESC, id DESC) 可覆盖范围过滤和排序
+DROP INDEX IF EXISTS idx_news_heat_scores_heat_score;
+-- source_id：没有按来源过滤的查询
+DROP INDEX IF EXISTS idx_news_heat_scores_source_id;
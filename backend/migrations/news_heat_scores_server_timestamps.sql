@@ -0,0 +1,16 @@
+-- news_heat_scores 的 calculated_at/updated_at 改由数据库设置（UTC，无时区）
+ALTER TABLE news_heat_scores ALTER COLUMN calculated_at SET DEFAULT (NOW() AT TIME ZONE 'utc');
+ALTER TABLE news_heat_scores ALTER COLUMN updated_at SET DEFAULT (NOW() AT TIME ZONE 'utc');
+
+-- 更新时由数据库刷新 updated_at
+CREATE OR REPLACE FUNCTION set_news_heat_scores_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := (now() AT TIME ZONE 'utc');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_heat_scores_updated_at ON news_heat_scores;
+CREATE TRIGGER trg_news_heat_scores_updated_at
+    BEFORE UPDATE ON news_heat_scores
+    FOR EACH ROW EXECUTE FUNCTION set_news_heat_scores_updated_at();
@@ -0,0 +1,8 @@
+-- news_heat_scores.id 改为原生 UUID 类型（16字节，原先为36字节文本），并由数据库生成
+-- gen_random_uuid() 在 PostgreSQL 13+ 内置，更早版本由 pgcrypto 提供
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+-- 已有的 id 均由 uuid4 生成，可直接转换；主键及 (heat_score, id) 索引随类型转换一并重建
+ALTER TABLE news_heat_scores
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid();
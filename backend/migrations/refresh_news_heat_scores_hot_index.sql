@@ -0,0 +1,20 @@
+-- 维护脚本：重建 news_heat_scores 热门时间窗口的部分索引
+--
+-- 热门查询总是按 published_at >= now() - 72h 过滤并按 heat_score DESC 排序。
+-- 索引谓词中不能使用 now()（非 IMMUTABLE），因此这里把截止时间写成字面量，
+-- 截止时间取当天零点往前4天，覆盖72小时窗口。截止时间之后的数据始终在索引中，
+-- 只是索引会随时间变大，建议每天通过定时任务执行一次：
+--
+--   psql "$DATABASE_URL" -f migrations/refresh_news_heat_scores_hot_index.sql
+--
+-- 使用 psql 的 \gexec 执行动态生成的语句；CONCURRENTLY 不能在事务块中执行，不要加 -1 参数。
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_news_heat_scores_hot_new;
+
+SELECT format(
+    'CREATE INDEX CONCURRENTLY idx_news_heat_scores_hot_new ON news_heat_scores (heat_score DESC, id DESC) WHERE published_at >= %L',
+    date_trunc('day', now() AT TIME ZONE 'utc') - interval '4 days'
+) \gexec
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_news_heat_scores_hot;
+ALTER INDEX idx_news_heat_scores_hot_new RENAME TO idx_news_heat_scores_hot;
@@ -0,0 +1,5 @@
+-- topics / content_suggestions 的 created_at/updated_at 改由数据库设置（UTC，无时区，与应用原先写入的 utcnow 一致）
+ALTER TABLE topics ALTER COLUMN created_at SET DEFAULT (NOW() AT TIME ZONE 'utc');
+ALTER TABLE topics ALTER COLUMN updated_at SET DEFAULT (NOW() AT TIME ZONE 'utc');
+ALTER TABLE content_suggestions ALTER COLUMN created_at SET DEFAULT (NOW() AT TIME ZONE 'utc');
+ALTER TABLE content_suggestions ALTER COLUMN updated_at SET DEFAULT (NOW() AT TIME ZONE 'utc');
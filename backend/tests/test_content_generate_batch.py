@@ -0,0 +1,61 @@
+"""
+批量内容生成接口单元测试：ID数量上限、去重，单话题接口走批量路径
+"""
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.api.v1 import content as content_api
+from app.api.v1.content import MAX_BATCH_TOPICS, TopicIdsRequest
+from app.schemas.content import GeneratedContent
+
+
+def _content(title):
+    return GeneratedContent(title_suggestions=[title], outline=[], key_points=[], introduction=title)
+
+
+@pytest.fixture
+def batch_calls(monkeypatch):
+    calls = []
+
+    async def generate_content_for_topics(db, topic_ids):
+        calls.append(list(topic_ids))
+        return {topic_id: _content(f"话题{topic_id}") for topic_id in topic_ids if topic_id != 404}
+
+    monkeypatch.setattr(
+        content_api.ContentService, "generate_content_for_topics", staticmethod(generate_content_for_topics)
+    )
+    return calls
+
+
+@pytest.mark.parametrize("topic_ids", [[], list(range(MAX_BATCH_TOPICS + 1))])
+def test_topic_ids_are_bounded(topic_ids):
+    with pytest.raises(ValidationError):
+        TopicIdsRequest(topic_ids=topic_ids)
+
+
+@pytest.mark.asyncio
+async def test_batch_ignores_duplicate_ids(batch_calls):
+    result = await content_api.generate_content_batch(
+        request=TopicIdsRequest(topic_ids=[3, 1, 3, 404, 1, 404]), db=None
+    )
+
+    assert batch_calls == [[3, 1, 404]]
+    assert list(result["contents"]) == [3, 1]
+    assert result["not_found"] == [404]
+
+
+@pytest.mark.asyncio
+async def test_single_topic_delegates_to_batch(batch_calls):
+    result = await content_api.generate_content(topic_id=7, db=None)
+
+    assert batch_calls == [[7]]
+    assert result.title_suggestions == ["话题7"]
+
+
+@pytest.mark.asyncio
+async def test_single_unknown_topic_is_404(batch_calls):
+    with pytest.raises(HTTPException) as exc_info:
+        await content_api.generate_content(topic_id=404, db=None)
+
+    assert exc_info.value.status_code == 404
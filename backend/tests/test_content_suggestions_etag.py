@@ -0,0 +1,112 @@
+"""
+内容建议接口缓存头单元测试：话题分支的ETag/304，随机分支不缓存
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+from app.api.v1 import content as content_api
+
+
+def _request(if_none_match=None) -> Request:
+    headers = []
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+class _Suggestion:
+    def to_dict(self):
+        return {"content": "示例"}
+
+
+@pytest.fixture
+def fake_crud(monkeypatch):
+    state = SimpleNamespace(
+        count=2, last_updated=datetime(2024, 1, 1, 8, 0), by_topic_calls=0, topic_exists=True
+    )
+
+    async def get_topic_stats(db, *, topic_id):
+        return state.count, state.last_updated
+
+    async def get_by_topic(db, *, topic_id, limit):
+        state.by_topic_calls += 1
+        return [_Suggestion()]
+
+    async def get_random(db, *, limit):
+        return [_Suggestion()]
+
+    async def get_topic(db, id):
+        return object() if state.topic_exists else None
+
+    monkeypatch.setattr(content_api.content_suggestion, "get_topic_stats", get_topic_stats)
+    monkeypatch.setattr(content_api.content_suggestion, "get_by_topic", get_by_topic)
+    monkeypatch.setattr(content_api.content_suggestion, "get_random", get_random)
+    monkeypatch.setattr(content_api.topic, "get", get_topic)
+    return state
+
+
+async def _call(request, topic_id=None, limit=10):
+    response = Response()
+    result = await content_api.get_content_suggestions(
+        request=request, response=response, topic_id=topic_id, limit=limit, db=None
+    )
+    return result, response
+
+
+@pytest.mark.asyncio
+async def test_topic_suggestions_carry_etag_and_public_cache(fake_crud):
+    result, response = await _call(_request(), topic_id=1)
+
+    assert result == {"suggestions": [{"content": "示例"}]}
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"] == content_api.SUGGESTIONS_CACHE_CONTROL
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_returns_304_without_loading(fake_crud):
+    _, first = await _call(_request(), topic_id=1)
+
+    result, _ = await _call(_request(first.headers["ETag"]), topic_id=1)
+
+    assert result.status_code == 304
+    assert fake_crud.by_topic_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_etag_changes_when_suggestions_change(fake_crud):
+    _, first = await _call(_request(), topic_id=1)
+
+    fake_crud.last_updated = datetime(2024, 1, 2, 8, 0)
+    result, second = await _call(_request(first.headers["ETag"]), topic_id=1)
+
+    assert isinstance(result, dict)
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+    fake_crud.count = 1
+    _, third = await _call(_request(), topic_id=1)
+    assert third.headers["ETag"] != second.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_random_suggestions_are_not_cached(fake_crud):
+    result, response = await _call(_request('"anything"'))
+
+    assert isinstance(result, dict)
+    assert "ETag" not in response.headers
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+@pytest.mark.asyncio
+async def test_unknown_topic_with_matching_etag_is_404(fake_crud):
+    _, first = await _call(_request(), topic_id=1)
+
+    # 话题被删除后，建议统计与缓存时相同也不能返回304
+    fake_crud.topic_exists = False
+    with pytest.raises(HTTPException) as exc_info:
+        await _call(_request(first.headers["ETag"]), topic_id=1)
+
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,167 @@
+"""
+内容建议模板缓存单元测试：版本号变化后重新加载（按间隔比对），加载失败时沿用已有模板，写入后失效
+"""
+import importlib
+
+import pytest
+
+from app.db.redis import MemoryCache, redis_manager
+from app.services.content_service import ContentService
+
+# app.services 包导出了同名的服务实例，这里需要模块本身
+content_service = importlib.import_module("app.services.content_service")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class TemplateSession:
+    """按预设行返回模板查询结果的假会话"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+        self.fail = False
+
+    async def execute(self, stmt, params=None):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.loads += 1
+        return list(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def memory_redis(monkeypatch):
+    monkeypatch.setattr(redis_manager, "redis_client", MemoryCache())
+    monkeypatch.setattr(content_service, "_suggestion_templates", None)
+    monkeypatch.setattr(content_service, "_suggestion_templates_version", None)
+    monkeypatch.setattr(content_service, "_suggestion_templates_checked_at", 0.0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(content_service.time, "monotonic", clock.monotonic)
+    return clock
+
+
+class CountingRedis(MemoryCache):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return await super().get(key)
+
+
+@pytest.mark.asyncio
+async def test_templates_are_served_from_memory_while_version_is_unchanged():
+    db = TemplateSession([("科技", "title", "{topic}的现状")])
+    await ContentService.load_content_suggestions(db)
+
+    first = await ContentService.get_content_suggestions_by_category(db, "科技")
+    second = await ContentService.get_content_suggestions_by_category(db, "科技")
+
+    assert first["title_templates"] == ["{topic}的现状"]
+    assert second == first
+    assert db.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_version_change_from_another_process_triggers_reload(clock):
+    db = TemplateSession([("科技", "title", "旧模板")])
+    await ContentService.load_content_suggestions(db)
+
+    # 其他进程写入内容建议后更新了版本号
+    db.rows = [("科技", "title", "新模板")]
+    await redis_manager.set(content_service.SUGGESTIONS_VERSION_KEY, "other-process")
+
+    # 比对间隔内仍使用内存中的模板
+    result = await ContentService.get_content_suggestions_by_category(db, "科技")
+    assert result["title_templates"] == ["旧模板"]
+
+    clock.now += content_service.SUGGESTIONS_VERSION_CHECK_INTERVAL
+    result = await ContentService.get_content_suggestions_by_category(db, "科技")
+
+    assert result["title_templates"] == ["新模板"]
+    assert db.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_version_key_triggers_reload(clock):
+    db = TemplateSession([("科技", "title", "旧模板")])
+    await ContentService.load_content_suggestions(db)
+
+    await redis_manager.delete(content_service.SUGGESTIONS_VERSION_KEY)
+    db.rows = [("科技", "title", "新模板")]
+    clock.now += content_service.SUGGESTIONS_VERSION_CHECK_INTERVAL
+
+    result = await ContentService.get_content_suggestions_by_category(db, "科技")
+
+    assert result["title_templates"] == ["新模板"]
+
+
+@pytest.mark.asyncio
+async def test_version_is_checked_at_most_once_per_interval(clock, monkeypatch):
+    redis = CountingRedis()
+    monkeypatch.setattr(redis_manager, "redis_client", redis)
+    db = TemplateSession([("科技", "title", "模板")])
+    await ContentService.load_content_suggestions(db)
+    gets = redis.gets
+
+    for _ in range(10):
+        await ContentService.get_content_suggestions_by_category(db, "科技")
+    assert redis.gets == gets
+
+    clock.now += content_service.SUGGESTIONS_VERSION_CHECK_INTERVAL
+    await ContentService.get_content_suggestions_by_category(db, "科技")
+    await ContentService.get_content_suggestions_by_category(db, "科技")
+    assert redis.gets == gets + 1
+
+
+@pytest.mark.asyncio
+async def test_local_write_reloads_without_waiting(clock, monkeypatch):
+    db = TemplateSession([("科技", "title", "旧模板")])
+    await ContentService.load_content_suggestions(db)
+
+    async def create(db, *, obj_in):
+        db.rows = [("科技", "title", obj_in)]
+        return obj_in
+
+    monkeypatch.setattr(content_service.content_suggestion, "create", create)
+    await ContentService.create_suggestion(db, "新模板")
+
+    result = await ContentService.get_content_suggestions_by_category(db, "科技")
+
+    assert result["title_templates"] == ["新模板"]
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_previous_templates():
+    db = TemplateSession([("科技", "title", "旧模板")])
+    await ContentService.load_content_suggestions(db)
+
+    await ContentService.clear_content_suggestions_cache()
+    db.fail = True
+
+    result = await ContentService.get_content_suggestions_by_category(db, "科技")
+
+    assert result["title_templates"] == ["旧模板"]
+
+
+@pytest.mark.asyncio
+async def test_returned_templates_do_not_alias_cache():
+    db = TemplateSession([("科技", "title", "模板")])
+    await ContentService.load_content_suggestions(db)
+
+    result = await ContentService.get_content_suggestions_by_category(db, "科技")
+    result["title_templates"] = []
+
+    again = await ContentService.get_content_suggestions_by_category(db, "科技")
+    assert again["title_templates"] == ["模板"]
@@ -0,0 +1,154 @@
+"""
+HeatLink客户端缓存单元测试：并发未命中合并为一次请求，5xx时返回过期缓存
+"""
+import asyncio
+import gc
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from tenacity import wait_none
+
+from app.core.config import settings
+from app.db.redis import MemoryCache, redis_manager
+from app.services.heatlink_client import HeatLinkAPIClient
+
+
+class Upstream:
+    """可控的HeatLink替身：记录请求次数，可暂停响应或返回指定状态码"""
+
+    def __init__(self):
+        self.calls = 0
+        self.status = 200
+        self.body = {"sources": [{"id": "a"}, {"id": "b"}]}
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def handler(self, request):
+        self.calls += 1
+        await self.release.wait()
+        if self.status != 200:
+            return httpx.Response(self.status, json={"detail": "upstream error"})
+        return httpx.Response(200, json=self.body)
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+@pytest_asyncio.fixture
+async def client(upstream, monkeypatch):
+    monkeypatch.setattr(redis_manager, "redis_client", MemoryCache())
+    monkeypatch.setattr(settings, "HEATLINK_RATE_LIMIT", 0)
+    # 502/503/504会重试，测试中不等待退避时间
+    monkeypatch.setattr(HeatLinkAPIClient._send_with_retry.retry, "wait", wait_none())
+    client = HeatLinkAPIClient(base_url="http://heatlink.test/api")
+    await client.aclose()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_request(client, upstream):
+    upstream.release.clear()
+    waiters = [asyncio.ensure_future(client.get("external/sources")) for _ in range(5)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    results = await asyncio.gather(*waiters)
+
+    assert upstream.calls == 1
+    assert all(result == upstream.body for result in results)
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_get_independent_copies(client, upstream):
+    upstream.release.clear()
+    first = asyncio.ensure_future(client.get("external/sources"))
+    second = asyncio.ensure_future(client.get("external/sources"))
+    await asyncio.sleep(0)
+    upstream.release.set()
+    first_result, second_result = await asyncio.gather(first, second)
+
+    # 模拟get_weighted_sources原地修改结果
+    first_result["sources"].sort(key=lambda source: source["id"], reverse=True)
+    first_result["sources"][0]["weight"] = 10
+
+    assert first_result is not second_result
+    assert second_result == upstream.body
+
+
+@pytest.mark.asyncio
+async def test_failed_task_with_cancelled_waiters_is_retrieved(client, upstream):
+    upstream.release.clear()
+    upstream.status = 404
+    unretrieved = []
+    loop = asyncio.get_running_loop()
+    previous_handler = loop.get_exception_handler()
+    loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+    try:
+        waiter = asyncio.ensure_future(client.get("external/sources"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # 唯一的等待方已取消，请求任务随后失败
+        upstream.release.set()
+        while client._inflight:
+            await asyncio.sleep(0)
+        gc.collect()
+        await asyncio.sleep(0)
+    finally:
+        loop.set_exception_handler(previous_handler)
+
+    assert upstream.calls == 1
+    assert unretrieved == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [500, 503])
+async def test_server_error_falls_back_to_stale_copy(client, upstream, status):
+    assert await client.get("external/sources") == upstream.body
+
+    upstream.status = status
+    result = await client.get("external/sources", force_refresh=True)
+
+    assert result == upstream.body
+    assert upstream.calls == (2 if status == 500 else 4)
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_outlives_fresh_cache(client, upstream):
+    await client.get("external/sources")
+
+    # 正常缓存已过期，只剩保留更久的副本
+    client._local_cache.clear()
+    await redis_manager.delete("heatlink:sources")
+    upstream.status = 500
+
+    assert await client.get("external/sources") == upstream.body
+
+
+@pytest.mark.asyncio
+async def test_client_error_does_not_fall_back(client, upstream):
+    await client.get("external/sources")
+
+    upstream.status = 404
+    with pytest.raises(HTTPException) as exc_info:
+        await client.get("external/sources", force_refresh=True)
+
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_server_error_without_stale_copy_raises(client, upstream):
+    upstream.status = 500
+
+    with pytest.raises(HTTPException) as exc_info:
+        await client.get("external/sources")
+
+    assert exc_info.value.status_code == 500
@@ -0,0 +1,177 @@
+"""
+HeatLink客户端限速单元测试：令牌桶预订、等待上限、Retry-After/X-RateLimit响应头处理
+"""
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services import heatlink_client as heatlink_module
+from app.services.heatlink_client import HeatLinkAPIClient, _TokenBucket
+
+
+class FakeClock:
+    """替换time.monotonic和asyncio.sleep：sleep只记录时长，时间由测试推进"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(heatlink_module.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(heatlink_module.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def _bucket(rate=10, capacity=2, max_wait=5, max_retry_after=30):
+    return _TokenBucket(rate, capacity, max_wait=max_wait, max_retry_after=max_retry_after)
+
+
+@pytest.mark.asyncio
+async def test_burst_then_queued_reservations(clock):
+    bucket = _bucket()
+
+    for _ in range(5):
+        await bucket.acquire()
+
+    # 前两个用突发额度，之后每个预订依次排在前一个之后 1/rate 秒
+    assert clock.sleeps == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.asyncio
+async def test_tokens_refill_over_time(clock):
+    bucket = _bucket()
+    await bucket.acquire()
+    await bucket.acquire()
+
+    clock.now += 0.1
+    await bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_wait_beyond_max_wait_fails_fast_and_returns_reservation(clock):
+    bucket = _bucket(rate=1, capacity=1, max_wait=2)
+    await bucket.acquire()
+    await bucket.acquire()
+    await bucket.acquire()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await bucket.acquire()
+
+    assert exc_info.value.status_code == 503
+    assert clock.sleeps == [1.0, 2.0]
+    # 失败的预订已归还：时间推进后不必等待前面失败的那一次
+    clock.now += 3
+    await bucket.acquire()
+    assert clock.sleeps == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_clamped(clock):
+    bucket = _bucket(max_wait=60, max_retry_after=30)
+
+    bucket.observe(httpx.Headers({"Retry-After": "3600"}))
+    await bucket.acquire()
+
+    assert clock.sleeps == [30.1]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_longer_than_max_wait_fails_fast(clock):
+    bucket = _bucket(max_wait=5, max_retry_after=30)
+
+    bucket.observe(httpx.Headers({"Retry-After": "20"}))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await bucket.acquire()
+    assert exc_info.value.status_code == 503
+    assert clock.sleeps == []
+
+    # 暂停结束后令牌从零开始补充
+    clock.now += 21
+    await bucket.acquire()
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_retry_after_http_date_is_ignored(clock):
+    bucket = _bucket()
+
+    bucket.observe(httpx.Headers({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+    await bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_low_remaining_narrows_rate_until_reset(clock):
+    bucket = _bucket(rate=10)
+
+    bucket.observe(httpx.Headers({"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "10"}))
+    assert bucket.rate == pytest.approx(0.2)
+
+    clock.now += 10
+    bucket._refill(clock.now)
+    assert bucket.rate == 10
+
+
+def test_reset_as_unix_timestamp(clock, monkeypatch):
+    monkeypatch.setattr(heatlink_module.time, "time", lambda: 1_700_000_000.0)
+    bucket = _bucket(rate=10)
+
+    bucket.observe(httpx.Headers({"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": "1700000004"}))
+
+    assert bucket.rate == pytest.approx(0.25)
+
+
+def test_enough_remaining_keeps_rate(clock):
+    bucket = _bucket(rate=10)
+
+    bucket.observe(httpx.Headers({"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "10"}))
+
+    assert bucket.rate == 10
+
+
+@pytest.mark.asyncio
+async def test_non_positive_rate_disables_limiter(monkeypatch):
+    monkeypatch.setattr(settings, "HEATLINK_RATE_LIMIT", 0)
+    client = HeatLinkAPIClient(base_url="http://heatlink.test/api")
+    try:
+        assert client._limiter is None
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_after_long_retry_after(clock):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(429, headers={"Retry-After": "3600"}, json={"detail": "slow down"})
+
+    client = HeatLinkAPIClient(base_url="http://heatlink.test/api", timeout=5)
+    await client.aclose()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        with pytest.raises(HTTPException) as first:
+            await client.get("external/hot", use_cache=False)
+        with pytest.raises(HTTPException) as second:
+            await client.get("external/hot", use_cache=False)
+    finally:
+        await client.aclose()
+
+    assert first.value.status_code == 429
+    assert second.value.status_code == 503
+    assert calls == ["/api/external/hot"]
+    assert clock.sleeps == []
@@ -0,0 +1,106 @@
+"""
+MemoryCache单元测试：过期时间、过期键清理与键快照
+"""
+import pytest
+
+from app.db import redis as redis_module
+from app.db.redis import MemoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(redis_module.time, "monotonic", clock.monotonic)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_value_expires_after_ttl(clock):
+    cache = MemoryCache()
+    await cache.set("a", b"1", ex=10)
+    await cache.set("forever", b"2")
+
+    clock.now += 9.9
+    assert await cache.get("a") == b"1"
+
+    clock.now += 0.1
+    assert await cache.get("a") is None
+    assert await cache.exists("a") is False
+    assert await cache.get("forever") == b"2"
+
+
+@pytest.mark.asyncio
+async def test_setex_uses_ttl(clock):
+    cache = MemoryCache()
+    await cache.setex("a", 5, b"1")
+
+    clock.now += 5
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_evicted_on_write(clock):
+    cache = MemoryCache()
+    for i in range(100):
+        await cache.set(f"old:{i}", b"x", ex=1)
+
+    clock.now += 2
+    await cache.set("new", b"y", ex=1)
+
+    # 未读取的过期键在写入时被清理，不会无限堆积
+    assert list(cache._store) == ["new"]
+    assert await cache.dbsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_reset_key_keeps_new_ttl(clock):
+    cache = MemoryCache()
+    await cache.set("a", b"1", ex=1)
+    await cache.set("a", b"2", ex=10)
+
+    clock.now += 5
+    await cache.set("other", b"x")
+
+    # 堆中残留的旧过期时间不会删除重新设置过的键
+    assert await cache.get("a") == b"2"
+
+    await cache.set("a", b"3")
+    clock.now += 10
+    assert await cache.get("a") == b"3"
+
+
+@pytest.mark.asyncio
+async def test_keys_match_glob_and_follow_changes(clock):
+    cache = MemoryCache()
+    await cache.set("heatlink:hot", b"1")
+    await cache.set("heatlink:sources", b"2", ex=5)
+    await cache.set("topics:hot", b"3")
+
+    assert sorted(await cache.keys("heatlink:*")) == ["heatlink:hot", "heatlink:sources"]
+    assert len(await cache.keys()) == 3
+
+    await cache.delete("topics:hot")
+    assert sorted(await cache.keys()) == ["heatlink:hot", "heatlink:sources"]
+
+    clock.now += 5
+    assert await cache.keys("heatlink:*") == ["heatlink:hot"]
+    assert [key async for key in cache.scan_iter(match="heatlink:*")] == ["heatlink:hot"]
+
+
+@pytest.mark.asyncio
+async def test_delete_and_unlink_count_existing_keys(clock):
+    cache = MemoryCache()
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+
+    assert await cache.delete("a", "missing") == 1
+    assert await cache.unlink("b") == 1
+    assert await cache.dbsize() == 0
@@ -0,0 +1,64 @@
+"""
+NewsHeatScore模型单元测试：ORM更新后updated_at由RETURNING带回，异步会话中读取不触发懒加载
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.models.news_heat_score import NewsHeatScore
+
+pytest.importorskip("aiosqlite")
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest_asyncio.fixture
+async def db():
+    # 服务端默认值是PostgreSQL表达式，建表时临时去掉，测试数据显式写入
+    table = NewsHeatScore.__table__
+    columns = (table.c.id, table.c.calculated_at, table.c.updated_at)
+    saved = [column.server_default for column in columns]
+    for column in columns:
+        column.server_default = None
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(table.create)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+    finally:
+        await engine.dispose()
+        for column, server_default in zip(columns, saved):
+            column.server_default = server_default
+
+
+@pytest.mark.asyncio
+async def test_updated_at_is_loaded_after_orm_update(db):
+    score = NewsHeatScore(
+        id=uuid.uuid4(),
+        news_id="n1",
+        source_id="s1",
+        title="标题",
+        url="https://example.com/1",
+        heat_score=10.0,
+        published_at=datetime(2024, 1, 1),
+        calculated_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+    )
+    db.add(score)
+    await db.commit()
+
+    score.heat_score = 20.0
+    await db.flush()
+
+    # 未开启eager_defaults时，此处属性已过期，读取会在异步会话中触发懒加载并抛出MissingGreenlet
+    assert score.updated_at is not None
@@ -0,0 +1,110 @@
+"""
+Redis缓存值编解码单元测试：msgpack/JSON往返，以及升级前写入的JSON旧值
+"""
+import datetime
+import enum
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.db import redis as redis_module
+from app.db.redis import MemoryCache, RedisManager, _deserialize, _serialize
+
+VALUE = {
+    "title": "热点新闻",
+    "score": 87.5,
+    "count": 3,
+    "tags": ["科技", "财经"],
+    "nested": {"ok": True, "missing": None},
+}
+
+
+@pytest.fixture(params=["msgpack", "json"])
+def codec(request, monkeypatch):
+    if request.param == "msgpack":
+        pytest.importorskip("msgpack")
+    else:
+        monkeypatch.setattr(redis_module, "msgpack", None)
+    return request.param
+
+
+def test_round_trip(codec):
+    data = _serialize(VALUE)
+
+    assert _deserialize(data) == VALUE
+    if codec == "msgpack":
+        assert data[:1] == redis_module._MSGPACK_MARKER
+
+
+def test_round_trip_of_plain_values(codec):
+    for value in ("版本号", 42, 1.5, True, [1, "a"], {}):
+        assert _deserialize(_serialize(value)) == value
+
+
+def test_sets_and_datetimes_are_stored_like_json(codec):
+    moment = datetime.datetime(2024, 1, 2, 3, 4, 5)
+
+    value = _deserialize(_serialize({"ids": {1}, "at": moment, "day": moment.date()}))
+
+    assert value == {"ids": [1], "at": "2024-01-02T03:04:05", "day": "2024-01-02"}
+
+
+class Status(enum.Enum):
+    ACTIVE = "active"
+
+
+def test_uuids_decimals_and_enums_are_stored_like_json(codec):
+    score_id = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    value = {
+        "id": score_id,
+        "ids": [score_id],
+        "heat": Decimal("87.5"),
+        "count": Decimal("3"),
+        "status": Status.ACTIVE,
+        "time": datetime.time(8, 30),
+    }
+
+    assert _deserialize(_serialize(value)) == {
+        "id": "12345678-1234-5678-1234-567812345678",
+        "ids": ["12345678-1234-5678-1234-567812345678"],
+        "heat": 87.5,
+        "count": 3,
+        "status": "active",
+        "time": "08:30:00",
+    }
+
+
+def test_unsupported_types_still_raise(codec):
+    with pytest.raises(TypeError):
+        _serialize({"value": object()})
+
+
+def test_non_string_keys(codec):
+    assert _deserialize(_serialize({1: "a"})) in ({1: "a"}, {"1": "a"})
+
+
+def test_legacy_json_values_are_still_readable(codec):
+    # 升级前由json.dumps写入的值（Redis返回bytes）
+    assert _deserialize(b'{"title": "\\u70ed\\u70b9", "score": 1}') == {"title": "热点", "score": 1}
+    assert _deserialize('["a", 1]') == ["a", 1]
+    # set_raw直接写入的HeatLink响应原文
+    assert _deserialize('{"sources": []}'.encode()) == {"sources": []}
+
+
+def test_non_json_legacy_value_falls_back_to_text(codec):
+    assert _deserialize(b"plain text") == "plain text"
+    assert _deserialize("plain text") == "plain text"
+
+
+@pytest.mark.asyncio
+async def test_manager_round_trip_and_raw_values(codec, monkeypatch):
+    manager = RedisManager()
+    monkeypatch.setattr(manager, "redis_client", MemoryCache())
+
+    await manager.set("value", VALUE, expire=60)
+    await manager.set_raw("raw", b'{"hot": [1, 2]}', expire=60)
+
+    assert await manager.get("value") == VALUE
+    assert await manager.get("raw") == {"hot": [1, 2]}
+    assert await manager.mget(["value", "raw", "missing"]) == [VALUE, {"hot": [1, 2]}, None]
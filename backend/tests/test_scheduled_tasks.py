@@ -0,0 +1,49 @@
+"""
+计划任务单元测试：超时或停止调度器取消任务时，已发出的COMMIT仍执行完毕
+"""
+import asyncio
+
+import pytest
+
+from app.core import tasks
+from app.services.news_heat_score_service import heat_score_service
+
+
+class SlowCommitSession:
+    """COMMIT需要等待放行的假会话"""
+
+    def __init__(self):
+        self.commit_started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.committed = False
+        self.rolled_back = False
+
+    async def commit(self):
+        self.commit_started.set()
+        await self.release.wait()
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_commit_waits_for_commit(monkeypatch):
+    async def update_all_heat_scores(session):
+        return ["news"]
+
+    monkeypatch.setattr(heat_score_service, "update_all_heat_scores", update_all_heat_scores)
+    session = SlowCommitSession()
+
+    job = asyncio.ensure_future(tasks.update_heat_scores_task(session))
+    await session.commit_started.wait()
+    job.cancel()
+    await asyncio.sleep(0)
+    assert not job.done()
+
+    session.release.set()
+    with pytest.raises(asyncio.CancelledError):
+        await job
+
+    assert session.committed
+    assert not session.rolled_back
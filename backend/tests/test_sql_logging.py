@@ -0,0 +1,35 @@
+"""
+SQL日志单元测试：出错的语句不影响后续语句的耗时统计
+"""
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.db import session as db_session
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    event.listen(engine, "before_cursor_execute", db_session._before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", db_session._after_cursor_execute)
+    yield engine
+    engine.dispose()
+
+
+def test_failed_statement_does_not_leak_start_time(engine, monkeypatch):
+    durations = []
+    monkeypatch.setattr(db_session, "SQL_LOG_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(
+        db_session.logger, "bind", lambda **fields: durations.append(fields["duration_ms"]) or db_session.logger
+    )
+
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+
+        assert "query_start_time" not in conn.info
+
+    assert len(durations) == 1
+    assert 0 <= durations[0] < 1000
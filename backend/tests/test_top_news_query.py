@@ -0,0 +1,166 @@
+"""
+热度分数CRUD单元测试：分类筛选与游标分页的参数绑定、DISTINCT ON查询、删除失败回滚
+"""
+import uuid
+
+import pytest
+from fastapi import Response
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.heat_score import get_top_news as top_news_endpoint
+from app.crud import news_heat_score
+from app.services.news_heat_score_service import heat_score_service
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class CaptureSession:
+    """记录执行的语句并返回预设结果的假会话"""
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return _Result(self.rows)
+
+    def compiled(self):
+        return self.statements[-1].compile(dialect=postgresql.dialect())
+
+
+def _where_sql(compiled) -> str:
+    return str(compiled).split("WHERE", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_service_passes_category_to_query():
+    db = CaptureSession()
+
+    await heat_score_service.get_top_news(limit=10, category="科技,财经", session=db)
+
+    compiled = db.compiled()
+    where = _where_sql(compiled)
+    assert "news_heat_scores.category IN" in where
+    assert "(news_heat_scores.heat_score, news_heat_scores.id) <" not in where
+    assert ["科技", "财经"] in compiled.params.values()
+
+
+@pytest.mark.asyncio
+async def test_positional_category_is_not_bound_to_cursor():
+    db = CaptureSession()
+
+    await news_heat_score.get_top_news_as_dict(db, 10, 0, None, 72, "科技")
+
+    where = _where_sql(db.compiled())
+    assert "news_heat_scores.category IN" in where
+    assert "(news_heat_scores.heat_score, news_heat_scores.id) <" not in where
+
+
+@pytest.mark.asyncio
+async def test_category_filter_combined_with_cursor():
+    db = CaptureSession()
+    cursor_id = uuid.uuid4()
+
+    await news_heat_score.get_top_news_as_dict(
+        db, limit=10, category="科技", cursor_heat=80.5, cursor_id=cursor_id
+    )
+
+    compiled = db.compiled()
+    where = _where_sql(compiled)
+    assert "news_heat_scores.category IN" in where
+    assert "(news_heat_scores.heat_score, news_heat_scores.id) <" in where
+    assert "OFFSET" not in str(compiled)
+    params = list(compiled.params.values())
+    assert ["科技"] in params
+    assert 80.5 in params
+    assert cursor_id in params
+
+
+@pytest.mark.asyncio
+async def test_cursor_params_are_keyword_only():
+    with pytest.raises(TypeError):
+        await news_heat_score.get_top_news_as_dict(
+            CaptureSession(), 10, 0, None, 72, "科技", 80.5, uuid.uuid4()
+        )
+
+
+@pytest.mark.asyncio
+async def test_endpoint_returns_next_cursor_for_full_page():
+    last_id = str(uuid.uuid4())
+    rows = [
+        {"id": str(uuid.uuid4()), "heat_score": 90.0, "category": "科技"},
+        {"id": last_id, "heat_score": 85.0, "category": "科技"},
+    ]
+    response = Response()
+
+    result = await top_news_endpoint(
+        response=response, limit=2, skip=0, min_score=None, max_age_hours=72,
+        category="科技", cursor_heat=None, cursor_id=None, db=CaptureSession(rows),
+    )
+
+    assert result == rows
+    assert response.headers["X-Next-Cursor-Heat"] == "85.0"
+    assert response.headers["X-Next-Cursor-Id"] == last_id
+
+
+@pytest.mark.asyncio
+async def test_endpoint_omits_cursor_on_last_page():
+    response = Response()
+
+    await top_news_endpoint(
+        response=response, limit=5, skip=0, min_score=None, max_age_hours=72,
+        category=None, cursor_heat=None, cursor_id=None,
+        db=CaptureSession([{"id": str(uuid.uuid4()), "heat_score": 50.0}]),
+    )
+
+    assert "X-Next-Cursor-Heat" not in response.headers
+
+
+def test_latest_by_news_ids_uses_distinct_on():
+    sql = str(news_heat_score._LATEST_BY_NEWS_IDS_STMT.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("SELECT DISTINCT ON (news_heat_scores.news_id)")
+    assert "ORDER BY news_heat_scores.news_id, news_heat_scores.calculated_at DESC" in sql
+
+
+@pytest.mark.parametrize(
+    "stmt", [news_heat_score._LATEST_SCORE_VALUES_STMT, news_heat_score._LATEST_DOCS_STMT]
+)
+def test_latest_value_queries_use_distinct_on(stmt):
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("SELECT DISTINCT ON (news_heat_scores.news_id)")
+
+
+class FailingSession:
+    def __init__(self):
+        self.rolled_back = False
+
+    async def execute(self, stmt, params=None):
+        raise RuntimeError("connection lost")
+
+    async def commit(self):
+        raise AssertionError("commit after failed statement")
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.mark.asyncio
+async def test_failed_delete_rolls_back():
+    db = FailingSession()
+
+    with pytest.raises(RuntimeError):
+        await news_heat_score.delete(db, uuid.uuid4())
+
+    assert db.rolled_back
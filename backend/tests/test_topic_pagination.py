@@ -0,0 +1,104 @@
+"""
+话题分页单元测试：游标分页与OFFSET分页结果一致，include_total=False时total为空
+"""
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.topics import list_topics
+from app.models.topic import Topic
+from app.schemas.topic import TopicList
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest_asyncio.fixture
+async def db():
+    # 模型的服务端默认值是PostgreSQL表达式，建表时临时去掉，测试数据显式写入时间
+    columns = (Topic.__table__.c.created_at, Topic.__table__.c.updated_at)
+    saved = [column.server_default for column in columns]
+    for column in columns:
+        column.server_default = None
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Topic.__table__.create)
+        now = datetime(2024, 1, 1)
+        rows = [
+            {
+                "id": i,
+                "title": f"话题{i}",
+                "source_id": "测试来源",
+                "category": "科技" if i % 2 else "财经",
+                # 有重复的heat，验证按id稳定排序
+                "heat": float(i // 3),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(1, 26)
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(insert(Topic), rows)
+
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+    finally:
+        await engine.dispose()
+        for column, server_default in zip(columns, saved):
+            column.server_default = server_default
+
+
+async def _list(db, **kwargs):
+    params = dict(category=None, page=1, page_size=4, cursor_heat=None, cursor_id=None, include_total=True)
+    params.update(kwargs)
+    return TopicList.model_validate(await list_topics(db=db, **params))
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_offset_pages(db):
+    offset_ids = []
+    for page in range(1, 5):
+        result = await _list(db, category="科技", page=page)
+        offset_ids.extend(item.id for item in result.items)
+
+    cursor_ids = []
+    cursor = None
+    while True:
+        result = await _list(
+            db,
+            category="科技",
+            cursor_heat=cursor.heat if cursor else None,
+            cursor_id=cursor.id if cursor else None,
+        )
+        cursor_ids.extend(item.id for item in result.items)
+        cursor = result.next_cursor
+        if cursor is None:
+            break
+
+    assert cursor_ids == offset_ids
+    assert len(cursor_ids) == 13
+    assert all(item_id % 2 for item_id in cursor_ids)
+
+
+@pytest.mark.asyncio
+async def test_total_is_optional(db):
+    result = await _list(db, include_total=False)
+
+    assert result.total is None
+    assert len(result.items) == 4
+    assert result.next_cursor is not None
+
+
+@pytest.mark.asyncio
+async def test_total_with_offset_and_cursor(db):
+    first = await _list(db, category="财经")
+    second = await _list(
+        db, category="财经", cursor_heat=first.next_cursor.heat, cursor_id=first.next_cursor.id
+    )
+
+    assert first.total == 12
+    assert second.total == 12